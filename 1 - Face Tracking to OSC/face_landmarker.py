@@ -0,0 +1,230 @@
+import cv2
+import mediapipe as mp
+import numpy as np
+import threading
+import time
+
+BaseOptions = mp.tasks.BaseOptions
+FaceLandmarker = mp.tasks.vision.FaceLandmarker
+FaceLandmarkerOptions = mp.tasks.vision.FaceLandmarkerOptions
+VisionRunningMode = mp.tasks.vision.RunningMode
+
+# blendshapes sent as control features when none are given on the command line
+DEFAULT_BLENDSHAPES = ["jawOpen", "mouthFunnel", "mouthPucker", "mouthSmileLeft", "mouthSmileRight"]
+
+
+class FaceLandmarkerTracker:
+    def __init__(self, model_path="face_landmarker.task", sensitivity=1.0,
+                 min_detection_confidence=0.5, min_tracking_confidence=0.5, draw_debug=True):
+        """
+        Face tracker based on the MediaPipe Tasks FaceLandmarker (live stream mode)
+
+        Frames are submitted with detect_async and results arrive on a callback,
+        so capture keeps going while inference runs. The mouth value comes from
+        the built-in jawOpen blendshape instead of landmark geometry.
+
+        Parameters:
+            model_path (str): path to the face_landmarker.task model bundle
+            sensitivity (float): open mouth sensitivity (the higher the sensitivity, the more sensitive)
+            min_detection_confidence (float): FaceLandmarker face detection reliability threshold
+            min_tracking_confidence (float): FaceLandmarker tracking reliability threshold
+            draw_debug (bool): draw debug information on the returned frame (off when a PreviewRenderer draws it)
+        """
+        self.sensitivity = sensitivity
+        self.draw_debug = draw_debug
+
+        options = FaceLandmarkerOptions(
+            base_options=BaseOptions(model_asset_path=model_path),
+            running_mode=VisionRunningMode.LIVE_STREAM,
+            num_faces=1,
+            min_face_detection_confidence=min_detection_confidence,
+            min_face_presence_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence,
+            output_face_blendshapes=True,
+            result_callback=self._on_result
+        )
+        self.landmarker = FaceLandmarker.create_from_options(options)
+
+        # mouth landmarks indices (drawn for feedback only)
+        self.upper_lip_indices = [13]
+        self.lower_lip_indices = [14]
+        self.lip_connections = mp.solutions.face_mesh.FACEMESH_LIPS
+        self.mesh_connections = mp.solutions.face_mesh.FACEMESH_TESSELATION
+
+        # latest result written by the callback thread
+        self.result_lock = threading.Lock()
+        self.latest_landmarks = None
+        self.latest_timestamp = -1
+        self.last_submit_timestamp = -1
+        self.blendshapes = {}
+
+        self.mouth_open_calibration = None
+        self.mouth_closed_calibration = None
+        self.last_mouth_value = 0
+        self.is_calibrated = False
+        self.face_blob = None
+        self.landmark_points = None
+
+        self.last_process_time = time.time()
+        self.frame_count = 0
+        self.fps = 0
+
+    def calibrate(self, mouth_closed_value, mouth_open_value):
+        """
+        Method to calibrate the minimum/maximum value of the degree of mouth opening
+
+        Parameters:
+            mouth_closed_value (float): jawOpen score (0-127 scale) when closed
+            mouth_open_value (float): jawOpen score (0-127 scale) when mouth is open to the maximum
+        """
+        self.mouth_closed_calibration = mouth_closed_value
+        self.mouth_open_calibration = mouth_open_value
+        self.is_calibrated = True
+
+    def reset_calibration(self):
+        """RESET"""
+        self.mouth_closed_calibration = None
+        self.mouth_open_calibration = None
+        self.is_calibrated = False
+
+    def _on_result(self, result, output_image, timestamp_ms):
+        """FaceLandmarker result callback (runs on the MediaPipe thread)"""
+        landmarks = result.face_landmarks[0] if result.face_landmarks else None
+        blendshapes = {}
+        if result.face_blendshapes:
+            blendshapes = {c.category_name: c.score for c in result.face_blendshapes[0]}
+
+        with self.result_lock:
+            if timestamp_ms < self.latest_timestamp:
+                return
+            self.latest_timestamp = timestamp_ms
+            self.latest_landmarks = landmarks
+            self.blendshapes = blendshapes
+
+    def get_features(self, names=None):
+        """
+        Latest blendshape scores
+
+        Parameters:
+            names (list): blendshape names to return (Default: all)
+
+        Returns:
+            dict: blendshape name -> score (0.0-1.0)
+        """
+        with self.result_lock:
+            blendshapes = dict(self.blendshapes)
+        if names is None:
+            return blendshapes
+        return {name: blendshapes[name] for name in names if name in blendshapes}
+
+    def get_face_blob(self):
+        """
+        Face position and size in the same form as GEM pix_blob
+
+        Returns:
+            tuple: (x, y, size) normalized to 0.0-1.0, or None before the first detection
+        """
+        return self.face_blob
+
+    def get_landmark_points(self):
+        """
+        Returns:
+            np.ndarray: (N, 2) normalized landmark positions of the latest result, or None without a face
+        """
+        return self.landmark_points
+
+    def _compute_face_blob(self, points):
+        x, y = np.clip(points.mean(axis=0), 0.0, 1.0)
+        extent = np.clip(points.max(axis=0), 0.0, 1.0) - np.clip(points.min(axis=0), 0.0, 1.0)
+        return float(x), float(y), float(extent[0] * extent[1])
+
+    def process_frame(self, frame):
+        """
+        Submit a video frame and read the most recent detection result
+
+        Parameters:
+            frame: Video frame to be processed (in BGR format)
+
+        Returns:
+            processed_frame: frame with debug information added (the input frame when draw_debug is off)
+            mouth_value: degree of mouth opening (0-127)
+            success: face detection successful
+        """
+        self.frame_count += 1
+
+        if self.frame_count % 10 == 0:
+            current_time = time.time()
+            self.fps = 10 / (current_time - self.last_process_time)
+            self.last_process_time = current_time
+
+        # timestamps must be strictly increasing for live stream mode
+        timestamp_ms = int(time.monotonic() * 1000)
+        if timestamp_ms <= self.last_submit_timestamp:
+            timestamp_ms = self.last_submit_timestamp + 1
+        self.last_submit_timestamp = timestamp_ms
+
+        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=frame_rgb)
+        self.landmarker.detect_async(mp_image, timestamp_ms)
+
+        with self.result_lock:
+            landmarks = self.latest_landmarks
+            jaw_open = self.blendshapes.get("jawOpen")
+
+        processed_frame = frame.copy() if self.draw_debug else frame
+
+        mouth_value = self.last_mouth_value
+        success = False
+        self.landmark_points = None
+
+        if landmarks is not None and jaw_open is not None:
+            if self.is_calibrated:
+                min_score = self.mouth_closed_calibration
+                max_score = self.mouth_open_calibration
+            else:
+                min_score = 0
+                max_score = 127
+
+            adjusted_score = jaw_open * 127 * self.sensitivity
+            mapped_value = np.interp(adjusted_score, [min_score, max_score], [0, 127])
+            mouth_value = int(np.clip(mapped_value, 0, 127))
+            self.last_mouth_value = mouth_value
+            self.landmark_points = np.array([(lm.x, lm.y) for lm in landmarks])
+            self.face_blob = self._compute_face_blob(self.landmark_points)
+            success = True
+
+            if self.draw_debug:
+                self._draw_debug_info(processed_frame, landmarks, mouth_value, jaw_open)
+
+        if self.draw_debug:
+            cv2.putText(processed_frame, f"FPS: {self.fps:.1f}", (10, 30),
+                        cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
+            cv2.putText(processed_frame, f"Mouth: {mouth_value}", (10, 70),
+                        cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
+
+        return processed_frame, mouth_value, success
+
+    def _draw_debug_info(self, frame, landmarks, mouth_value, jaw_open):
+        """Visualize debug information to a frame"""
+        h, w, _ = frame.shape
+        for idx in self.upper_lip_indices + self.lower_lip_indices:
+            pos = landmarks[idx]
+            cx, cy = int(pos.x * w), int(pos.y * h)
+            cv2.circle(frame, (cx, cy), 5, (0, 0, 255), -1)
+
+        bar_x, bar_y = w - 50, 50
+        bar_height = 200
+        bar_width = 30
+
+        cv2.rectangle(frame, (bar_x, bar_y), (bar_x + bar_width, bar_y + bar_height),
+                     (100, 100, 100), -1)
+
+        value_height = int((mouth_value / 127) * bar_height)
+        cv2.rectangle(frame, (bar_x, bar_y + bar_height - value_height),
+                     (bar_x + bar_width, bar_y + bar_height), (0, 255, 0), -1)
+
+        cv2.putText(frame, f"jawOpen: {jaw_open:.2f}", (w - 190, bar_y + bar_height + 30),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+
+    def release(self):
+        self.landmarker.close()
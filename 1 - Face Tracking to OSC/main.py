@@ -3,6 +3,29 @@ import argparse
 import time
 from face_tracker import FaceTracker
 from osc_sender import OscSender
+from pd_sender import PdSender
+from preview_renderer import PreviewRenderer
+
+
+def create_tracker(args):
+    """Build the face tracker selected with --tracker"""
+    if args.tracker == 'landmarker':
+        # imported here so the legacy tracker keeps working without the Tasks API
+        from face_landmarker import FaceLandmarkerTracker
+        return FaceLandmarkerTracker(
+            model_path=args.model,
+            sensitivity=args.sensitivity,
+            min_detection_confidence=args.detection_confidence,
+            min_tracking_confidence=args.tracking_confidence,
+            draw_debug=False
+        )
+
+    return FaceTracker(
+        sensitivity=args.sensitivity,
+        min_detection_confidence=args.detection_confidence,
+        min_tracking_confidence=args.tracking_confidence,
+        draw_debug=False
+    )
 
 
 def parse_arguments():
@@ -17,6 +40,14 @@ def parse_arguments():
                         help='Camera capture height (default: 480)')
     
     # face track setting
+    parser.add_argument('--tracker', type=str, default='facemesh',
+                        choices=['facemesh', 'landmarker'],
+                        help='Face tracker: legacy FaceMesh or Tasks FaceLandmarker (default: facemesh)')
+    parser.add_argument('--model', type=str, default='face_landmarker.task',
+                        help='FaceLandmarker model path (default: face_landmarker.task)')
+    parser.add_argument('--blendshapes', type=str, nargs='*', default=None,
+                        help='Blendshapes sent as /blendshape/<name> with the landmarker tracker '
+                             '(default: jawOpen mouthFunnel mouthPucker mouthSmileLeft mouthSmileRight)')
     parser.add_argument('--sensitivity', type=float, default=1.0,
                         help='Mouth detection sensitivity (default: 1.0)')
     parser.add_argument('--detection-confidence', type=float, default=0.5,
@@ -31,10 +62,26 @@ def parse_arguments():
                         help='OSC server port (default: 8000)')
     parser.add_argument('--rate-limit', type=int, default=30,
                         help='Maximum OSC messages per second (default: 30)')
+    parser.add_argument('--timestamps', action='store_true',
+                        help='Append the send time to OSC messages, for the audio server jitter buffer (default: off)')
+    
+    # Pure Data setting
+    parser.add_argument('--pd-ip', type=str, default=None,
+                        help='Stream blob/mouth features to a Pd patch at this IP (default: disabled)')
+    parser.add_argument('--pd-port', type=int, default=3000,
+                        help='Pd netreceive port (default: 3000)')
+    parser.add_argument('--pd-protocol', type=str, default='fudi', choices=['fudi', 'osc'],
+                        help='Pd message format (default: fudi)')
     
     # other setting
     parser.add_argument('--no-preview', action='store_true',
                         help='Disable preview window')
+    parser.add_argument('--preview-fps', type=float, default=15,
+                        help='Maximum preview frame rate (default: 15)')
+    parser.add_argument('--preview-scale', type=float, default=0.5,
+                        help='Preview size relative to the camera frame (default: 0.5)')
+    parser.add_argument('--preview-mode', type=str, default='full', choices=['full', 'minimal'],
+                        help='Preview overlay: full (mesh, lips, meter, text) or minimal (lips and meter) (default: full)')
     
     return parser.parse_args()
 
@@ -52,25 +99,55 @@ def main():
         return
     
     # tracker and OSC sender reset
-    face_tracker = FaceTracker(
-        sensitivity=args.sensitivity,
-        min_detection_confidence=args.detection_confidence,
-        min_tracking_confidence=args.tracking_confidence
-    )
+    try:
+        face_tracker = create_tracker(args)
+    except Exception as e:
+        print(f"Error: Could not create {args.tracker} tracker: {e}")
+        cap.release()
+        return
+
+    if args.tracker == 'landmarker' and args.blendshapes is None:
+        from face_landmarker import DEFAULT_BLENDSHAPES
+        args.blendshapes = DEFAULT_BLENDSHAPES
     
     osc_sender = OscSender(
         ip=args.ip,
         port=args.port,
-        rate_limit=args.rate_limit
+        rate_limit=args.rate_limit,
+        timestamps=args.timestamps
     )
     
+    pd_sender = None
+    if args.pd_ip:
+        pd_sender = PdSender(
+            ip=args.pd_ip,
+            port=args.pd_port,
+            protocol=args.pd_protocol,
+            rate_limit=args.rate_limit
+        )
+    
     print(f"Starting mouth tracking to OSC:")
     print(f"  - Camera: {args.camera}")
+    print(f"  - Tracker: {args.tracker}")
     print(f"  - OSC Target: {args.ip}:{args.port}")
+    if pd_sender:
+        print(f"  - Pd Target: {args.pd_ip}:{args.pd_port} ({args.pd_protocol})")
     print(f"  - Rate Limit: {args.rate_limit} msg/sec")
     print(f"  - Sensitivity: {args.sensitivity}")
     print("Press 'q' to quit, 'c' to calibrate, 'r' to reset calibration")
     
+    # preview is drawn by its own thread at a capped rate and resolution
+    preview = None
+    if not args.no_preview:
+        preview = PreviewRenderer(
+            fps=args.preview_fps,
+            scale=args.preview_scale,
+            mode=args.preview_mode,
+            lip_connections=face_tracker.lip_connections,
+            mesh_connections=face_tracker.mesh_connections
+        )
+        preview.start()
+    
     # calibration
     calibration_mode = False
     calibration_step = 0
@@ -88,33 +165,33 @@ def main():
             # Process frame
             processed_frame, mouth_value, success = face_tracker.process_frame(frame)
             
+            prompt = None
             if calibration_mode:
                 if calibration_step == 0:
                     # mouth closed
-                    cv2.putText(processed_frame, "Keep mouth CLOSED and press 'c'", 
-                                (50, 120), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
+                    prompt = "Keep mouth CLOSED and press 'c'"
                 elif calibration_step == 1:
                     # mouth opened
-                    cv2.putText(processed_frame, "Open mouth WIDE and press 'c'", 
-                                (50, 120), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
+                    prompt = "Open mouth WIDE and press 'c'"
             
             # OSC message send (when face detected)
             if success:
                 osc_sender.send_mouth_value(mouth_value)
-                
-                # Send debug info
-                stats = osc_sender.get_statistics()
-                msg_rate = stats["messages_per_second"]
-                cv2.putText(processed_frame, f"OSC: {args.ip}:{args.port}", 
-                            (10, processed_frame.shape[0] - 70), 
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
-                cv2.putText(processed_frame, f"Msg Rate: {msg_rate:.1f}/s", 
-                            (10, processed_frame.shape[0] - 40), 
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
+                features = None
+                if args.tracker == 'landmarker' and args.blendshapes:
+                    features = face_tracker.get_features(args.blendshapes)
+                    osc_sender.send_features(features)
+                if pd_sender:
+                    pd_sender.send_frame(face_tracker.get_face_blob(), mouth_value, features)
             
             # Show processed frame
-            if not args.no_preview:
-                cv2.imshow('Mouth Tracking to OSC', processed_frame)
+            if preview:
+                msg_rate = osc_sender.get_statistics()["messages_per_second"]
+                lines = [f"FPS: {face_tracker.fps:.1f}",
+                         f"OSC: {args.ip}:{args.port}",
+                         f"Msg Rate: {msg_rate:.1f}/s"]
+                preview.submit(processed_frame, face_tracker.get_landmark_points(), mouth_value, lines, prompt)
+                preview.show('Mouth Tracking to OSC')
             
             # Check for key presses
             key = cv2.waitKey(1) & 0xFF
@@ -150,8 +227,12 @@ def main():
     
     finally:
         # Release resources
+        if preview:
+            preview.stop()
         cap.release()
         face_tracker.release()
+        if pd_sender:
+            pd_sender.close()
         cv2.destroyAllWindows()
         print("Program terminated")
 
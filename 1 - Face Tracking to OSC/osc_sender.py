@@ -1,9 +1,10 @@
 from pythonosc import udp_client
+from pythonosc.osc_message_builder import OscMessageBuilder
 import time
 
 
 class OscSender:
-    def __init__(self, ip="127.0.0.1", port=8000, rate_limit=30):
+    def __init__(self, ip="127.0.0.1", port=8000, rate_limit=30, timestamps=False):
         """
         Class for OSC message sending
         
@@ -11,12 +12,16 @@ class OscSender:
             ip (str): Server IP address 대상 서버의 IP 주소 (Default: localhost)
             port (int): Server port number (Default: 8000)
             rate_limit (int): send message per second
+            timestamps (bool): append the send time (double) to every message for the audio server jitter buffer
         """
         self.client = udp_client.SimpleUDPClient(ip, port)
         self.rate_limit = rate_limit
+        self.timestamps = timestamps
         self.min_interval = 1.0 / rate_limit if rate_limit > 0 else 0
         self.last_sent_time = 0
         self.last_sent_value = None
+        self.last_feature_time = 0
+        self.last_feature_values = {}
         
         self.message_count = 0
         self.start_time = time.time()
@@ -40,7 +45,7 @@ class OscSender:
         if (current_time - self.last_sent_time < self.min_interval) and not force:
             return False
             
-        self.client.send_message("/mouth", value)
+        self._send("/mouth", value)
         
         self.last_sent_time = current_time
         self.last_sent_value = value
@@ -48,6 +53,48 @@ class OscSender:
         
         return True
     
+    def send_features(self, features, prefix="/blendshape", force=False):
+        """
+        send named control features (e.g. blendshape scores) for OSC
+
+        Parameters:
+            features (dict): feature name -> value (0.0-1.0)
+            prefix (str): OSC address prefix, each feature goes to prefix/name
+            force (bool): force sending
+
+        Returns:
+            int: number of messages sent
+        """
+        current_time = time.time()
+
+        if (current_time - self.last_feature_time < self.min_interval) and not force:
+            return 0
+
+        sent = 0
+        for name, value in features.items():
+            value = round(float(value), 3)
+            if self.last_feature_values.get(name) == value and not force:
+                continue
+            self._send(f"{prefix}/{name}", value)
+            self.last_feature_values[name] = value
+            sent += 1
+
+        if sent:
+            self.last_feature_time = current_time
+            self.message_count += sent
+
+        return sent
+
+    def _send(self, address, value):
+        if not self.timestamps:
+            self.client.send_message(address, value)
+            return
+        # float32 cannot hold time.time() precisely, so the send time goes out as a double
+        builder = OscMessageBuilder(address)
+        builder.add_arg(value)
+        builder.add_arg(time.time(), OscMessageBuilder.ARG_TYPE_DOUBLE)
+        self.client.send(builder.build())
+
     def get_statistics(self):
         elapsed_time = time.time() - self.start_time
         if elapsed_time > 0:
@@ -0,0 +1,89 @@
+from pythonosc import udp_client
+import socket
+import time
+
+
+class PdSender:
+    def __init__(self, ip="127.0.0.1", port=3000, protocol="fudi", rate_limit=30):
+        """
+        Class for streaming face features to the Pure Data generative patch
+
+        FUDI messages ("blob x y size;", "mouth value;") are read by
+        [netreceive -u 3000] and [route blob mouth] in experiment-2.pd.
+        OSC messages (/blob, /mouth) need [netreceive -u -b] and [oscparse].
+
+        Parameters:
+            ip (str): Pd host IP address (Default: localhost)
+            port (int): Pd netreceive port (Default: 3000)
+            protocol (str): 'fudi' or 'osc'
+            rate_limit (int): send message per second
+        """
+        if protocol not in ("fudi", "osc"):
+            raise ValueError(f"Unknown Pd protocol: {protocol}")
+
+        self.ip = ip
+        self.port = port
+        self.protocol = protocol
+        if protocol == "osc":
+            self.client = udp_client.SimpleUDPClient(ip, port)
+        else:
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+        self.rate_limit = rate_limit
+        self.min_interval = 1.0 / rate_limit if rate_limit > 0 else 0
+        self.last_sent_time = 0
+
+        self.message_count = 0
+        self.start_time = time.time()
+
+    def _send(self, selector, values):
+        if self.protocol == "osc":
+            self.client.send_message(f"/{selector}", list(values))
+        else:
+            atoms = " ".join(f"{v:.4f}" if isinstance(v, float) else str(v) for v in values)
+            self.sock.sendto(f"{selector} {atoms};\n".encode("ascii"), (self.ip, self.port))
+        self.message_count += 1
+
+    def send_frame(self, face_blob, mouth_value, features=None, force=False):
+        """
+        send one frame of control data to Pd
+
+        Parameters:
+            face_blob (tuple): (x, y, size) like pix_blob, 0.0-1.0
+            mouth_value (int): (0-127)
+            features (dict): extra mouth features (e.g. blendshape name -> score)
+            force (bool): force sending
+
+        Returns:
+            bool: message sent status
+        """
+        current_time = time.time()
+
+        if (current_time - self.last_sent_time < self.min_interval) and not force:
+            return False
+
+        if face_blob is not None:
+            self._send("blob", [float(v) for v in face_blob])
+        self._send("mouth", [int(mouth_value)])
+        for name, value in (features or {}).items():
+            self._send(name, [float(value)])
+
+        self.last_sent_time = current_time
+        return True
+
+    def get_statistics(self):
+        elapsed_time = time.time() - self.start_time
+        if elapsed_time > 0:
+            msg_per_second = self.message_count / elapsed_time
+        else:
+            msg_per_second = 0
+
+        return {
+            "total_messages": self.message_count,
+            "elapsed_time": elapsed_time,
+            "messages_per_second": msg_per_second
+        }
+
+    def close(self):
+        if self.protocol == "fudi":
+            self.sock.close()
@@ -0,0 +1,207 @@
+import numpy as np
+import time
+from threading import Thread, Event
+
+
+class AudioBackend:
+    """
+    Output stream that pulls float32 blocks from a callback
+
+    The callback is called as callback(out, underflow) with a preallocated
+    (frames, channels) float32 array to fill in place. underflow is True when
+    the device reported an output underflow. Returning False stops the stream.
+    realtime is False when the callback is not paced by a clock and may take
+    as long as it needs.
+    """
+
+    realtime = True
+
+    def __init__(self, sample_rate=44100, channels=1, block_size=1024):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.block_size = block_size
+        self.out_buffer = np.zeros((block_size, channels), dtype=np.float32)
+        self.callback = None
+
+    def _buffer(self, frame_count):
+        if frame_count > len(self.out_buffer):
+            self.out_buffer = np.zeros((frame_count, self.channels), dtype=np.float32)
+        return self.out_buffer[:frame_count]
+
+    def start(self, callback):
+        raise NotImplementedError
+
+    def stop(self):
+        raise NotImplementedError
+
+    def close(self):
+        self.stop()
+
+
+class PyAudioBackend(AudioBackend):
+    """PortAudio output through PyAudio"""
+
+    def __init__(self, sample_rate=44100, channels=1, block_size=1024):
+        super().__init__(sample_rate, channels, block_size)
+        import pyaudio
+        self.pyaudio = pyaudio
+        self.p = pyaudio.PyAudio()
+        self.stream = None
+
+    def _stream_callback(self, in_data, frame_count, time_info, status):
+        out = self._buffer(frame_count)
+        if not self.callback(out, bool(status & self.pyaudio.paOutputUnderflow)):
+            return (None, self.pyaudio.paComplete)
+        return (out.tobytes(), self.pyaudio.paContinue)
+
+    def start(self, callback):
+        self.callback = callback
+        self.stream = self.p.open(
+            format=self.pyaudio.paFloat32,
+            channels=self.channels,
+            rate=self.sample_rate,
+            output=True,
+            frames_per_buffer=self.block_size,
+            stream_callback=self._stream_callback
+        )
+        self.stream.start_stream()
+
+    def stop(self):
+        if self.stream:
+            self.stream.stop_stream()
+            self.stream.close()
+            self.stream = None
+
+    def close(self):
+        self.stop()
+        if self.p:
+            self.p.terminate()
+            self.p = None
+
+
+class SoundDeviceBackend(AudioBackend):
+    """PortAudio output through sounddevice, the callback fills the device buffer directly"""
+
+    def __init__(self, sample_rate=44100, channels=1, block_size=1024):
+        super().__init__(sample_rate, channels, block_size)
+        import sounddevice
+        self.sd = sounddevice
+        self.stream = None
+
+    def _stream_callback(self, outdata, frames, time_info, status):
+        if not self.callback(outdata, status.output_underflow):
+            raise self.sd.CallbackStop
+
+    def start(self, callback):
+        self.callback = callback
+        self.stream = self.sd.OutputStream(
+            samplerate=self.sample_rate,
+            blocksize=self.block_size,
+            channels=self.channels,
+            dtype='float32',
+            callback=self._stream_callback
+        )
+        self.stream.start()
+
+    def stop(self):
+        if self.stream:
+            self.stream.stop()
+            self.stream.close()
+            self.stream = None
+
+
+class NullBackend(AudioBackend):
+    """
+    Discards audio, calling the callback from a thread paced by a simulated
+    real-time clock so timing behaves like a sound card without one
+    """
+
+    def __init__(self, sample_rate=44100, channels=1, block_size=1024, speed=1.0):
+        """
+        Parameters:
+            speed (float): clock speed relative to real time, 0 runs as fast as possible
+        """
+        super().__init__(sample_rate, channels, block_size)
+        self.speed = speed
+        self.realtime = speed > 0
+        self.stop_event = Event()
+        self.thread = None
+        self.frames_played = 0
+        self.late_callbacks = 0
+
+    def _consume(self, block):
+        pass
+
+    def _run(self):
+        block_time = self.block_size / self.sample_rate
+        next_time = time.perf_counter()
+        out = self._buffer(self.block_size)
+
+        while not self.stop_event.is_set():
+            if self.speed > 0:
+                next_time += block_time / self.speed
+                delay = next_time - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                elif delay < -block_time / self.speed:
+                    # the clock fell more than a block behind, like a late device callback
+                    self.late_callbacks += 1
+                    next_time = time.perf_counter()
+
+            if not self.callback(out, False):
+                break
+            self._consume(out)
+            self.frames_played += len(out)
+
+    def start(self, callback):
+        self.callback = callback
+        self.stop_event.clear()
+        self.thread = Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+
+
+class WavFileBackend(NullBackend):
+    """Writes the output to a float32 WAV file instead of a sound card"""
+
+    def __init__(self, output_file, sample_rate=44100, channels=1, block_size=1024, speed=1.0):
+        super().__init__(sample_rate, channels, block_size, speed)
+        import soundfile as sf
+        self.file = sf.SoundFile(output_file, mode='w', samplerate=sample_rate,
+                                 channels=channels, subtype='FLOAT')
+
+    def _consume(self, block):
+        self.file.write(block)
+
+    def close(self):
+        self.stop()
+        if not self.file.closed:
+            self.file.close()
+
+
+BACKENDS = ['pyaudio', 'sounddevice', 'wav', 'null']
+
+
+def create_backend(name, sample_rate=44100, channels=1, block_size=1024, output_file=None, speed=1.0):
+    """
+    Parameters:
+        name (str): one of BACKENDS
+        output_file (str): WAV path for the 'wav' backend
+        speed (float): clock speed of the 'wav' and 'null' backends, 0 runs as fast as possible
+    """
+    if name == 'pyaudio':
+        return PyAudioBackend(sample_rate, channels, block_size)
+    if name == 'sounddevice':
+        return SoundDeviceBackend(sample_rate, channels, block_size)
+    if name == 'wav':
+        if not output_file:
+            raise ValueError("the wav backend needs an output file")
+        return WavFileBackend(output_file, sample_rate, channels, block_size, speed)
+    if name == 'null':
+        return NullBackend(sample_rate, channels, block_size, speed)
+    raise ValueError(f"Unknown audio backend: {name}")
@@ -0,0 +1,312 @@
+import numpy as np
+import time
+import soundfile as sf
+from queue import Queue
+from threading import Thread, Event
+from ring_buffer import RingBuffer
+from audio_backends import create_backend
+
+
+def load_stems(audio_files):
+    """
+    Load one or more audio files as a (stems, samples) array
+
+    Stereo files are mixed down to mono and shorter stems are padded with
+    silence so all stems loop in sync. The stems are scaled together so their
+    unprocessed mix peaks at 1.0, keeping their relative levels.
+    """
+    stems = []
+    sample_rate = None
+    for path in audio_files:
+        data, rate = sf.read(path)
+        if len(data.shape) > 1 and data.shape[1] > 1:
+            data = np.mean(data, axis=1)
+        if sample_rate is not None and rate != sample_rate:
+            raise ValueError(f"{path}: sample rate {rate} does not match {sample_rate}")
+        sample_rate = rate
+        stems.append(data)
+    
+    audio_data = np.zeros((len(stems), max(len(s) for s in stems)))
+    for i, stem in enumerate(stems):
+        audio_data[i, :len(stem)] = stem
+    
+    peak = np.max(np.abs(audio_data.sum(axis=0)))
+    if peak > 0:
+        audio_data /= peak
+    return audio_data, sample_rate
+
+
+class AudioProcessor:
+    """processes audio files and applies real-time effects"""
+    
+    def __init__(self, audio_file, buffer_size=1024, sample_rate=44100,
+                 ahead_blocks=4, max_ahead_blocks=16, channels=1,
+                 backend='pyaudio', output_file=None, backend_speed=1.0):
+        """
+        Blocks are rendered ahead by a producer thread into a ring buffer,
+        the output backend callback only copies them out. Several files are played
+        as stems in sync, each with its own effect settings and send level;
+        effects run on the whole (stems, samples) block at once.
+
+        Parameters:
+            audio_file (str or list): audio file, or one file per stem
+            buffer_size (int)
+            sample_rate (int)
+            ahead_blocks (int): blocks rendered ahead of playback (minimum headroom)
+            max_ahead_blocks (int): upper limit for the adaptive headroom
+            channels (int): output channels, the mix is copied to every channel
+            backend (str or AudioBackend): 'pyaudio', 'sounddevice', 'wav', 'null' or a backend instance
+            output_file (str): WAV path for the 'wav' backend
+            backend_speed (float): clock speed of the 'wav'/'null' backends, 0 runs as fast as possible
+        """
+        self.audio_file = audio_file
+        self.buffer_size = buffer_size
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.min_ahead_blocks = max(1, ahead_blocks)
+        self.max_ahead_blocks = max(self.min_ahead_blocks, max_ahead_blocks)
+        
+        audio_files = [audio_file] if isinstance(audio_file, str) else list(audio_file)
+        self.audio_data, self.sample_rate = load_stems(audio_files)
+        self.num_stems = len(audio_files)
+        
+        self.reverb_amount = np.zeros(self.num_stems)
+        self.filter_cutoff = np.full(self.num_stems, 0.5)
+        self.distortion_amount = np.zeros(self.num_stems)
+        self.stem_gains = np.ones(self.num_stems)
+        # the mix passes unchanged below this level and is compressed smoothly towards 1.0 above it
+        self.limiter_threshold = 0.8
+        
+        self.audio_queue = Queue()
+        self.stop_event = Event()
+        self.is_playing = False
+        self.current_position = 0
+        
+        self.ring = RingBuffer(self.max_ahead_blocks * buffer_size, channels, dtype=np.float32)
+        self.producer = None
+        self.ahead_blocks = self.min_ahead_blocks
+        self.underrun_count = 0
+        # the producer woke to less than one buffered block, so the next callback was at risk
+        self.producer_late_count = 0
+        # headroom shrinks again after this long without underruns
+        self.headroom_decay_time = 10.0
+        self.reset_callback_timing()
+        
+        if isinstance(backend, str):
+            backend = create_backend(backend, self.sample_rate, channels, buffer_size,
+                                     output_file=output_file, speed=backend_speed)
+        self.backend = backend
+        
+    def _stems(self, stem):
+        """index for all stems (None), one stem or a list of stems"""
+        return slice(None) if stem is None else stem
+    
+    def set_reverb(self, amount, stem=None):
+        self.reverb_amount[self._stems(stem)] = np.clip(amount, 0.0, 1.0)
+        
+    def set_filter_cutoff(self, amount, stem=None):
+        self.filter_cutoff[self._stems(stem)] = np.clip(amount, 0.0, 1.0)
+        
+    def set_distortion(self, amount, stem=None):
+        self.distortion_amount[self._stems(stem)] = np.clip(amount, 0.0, 1.0)
+    
+    def set_stem_gain(self, amount, stem=None):
+        self.stem_gains[self._stems(stem)] = np.clip(amount, 0.0, 1.0)
+    
+    def apply_reverb(self, audio_chunk):
+        if not np.any(self.reverb_amount > 0):
+            return audio_chunk
+        
+        delay_samples = (self.sample_rate * 0.1 * self.reverb_amount).astype(int)
+        decay = 0.6 * self.reverb_amount
+        
+        # per-stem delay as one gather; stems with no delay get a zero tap
+        source = np.arange(audio_chunk.shape[1])[None, :] - delay_samples[:, None]
+        delayed = np.take_along_axis(audio_chunk, np.maximum(source, 0), axis=1)
+        delayed *= (source >= 0) * (delay_samples > 0)[:, None] * decay[:, None]
+        
+        return audio_chunk + delayed
+    
+    def apply_lowpass_filter(self, audio_chunk):
+        if np.all(self.filter_cutoff >= 1.0):
+            return audio_chunk
+        
+        # y[n] = (1 - c) x[n] + c y[n-1] with a different c per stem, solved as a
+        # log2(block) step prefix scan over all stems instead of one lfilter per stem
+        cutoff = 0.1 + 0.8 * self.filter_cutoff
+        filtered = (1 - cutoff)[:, None] * audio_chunk
+        coefficient = cutoff.copy()
+        shift = 1
+        while shift < audio_chunk.shape[1]:
+            filtered[:, shift:] = filtered[:, shift:] + coefficient[:, None] * filtered[:, :-shift]
+            coefficient = coefficient * coefficient
+            shift *= 2
+        
+        return np.where((self.filter_cutoff >= 1.0)[:, None], audio_chunk, filtered)
+    
+    def apply_distortion(self, audio_chunk):
+        if not np.any(self.distortion_amount > 0):
+            return audio_chunk
+        
+        gain = (1.0 + 4.0 * self.distortion_amount)[:, None]
+        distorted = np.tanh(audio_chunk * gain) / gain
+        return np.where((self.distortion_amount > 0)[:, None], distorted, audio_chunk)
+    
+    def apply_limiter(self, mix):
+        magnitude = np.abs(mix)
+        if not np.any(magnitude > self.limiter_threshold):
+            return mix
+        
+        knee = 1.0 - self.limiter_threshold
+        limited = self.limiter_threshold + knee * np.tanh((magnitude - self.limiter_threshold) / knee)
+        return np.where(magnitude > self.limiter_threshold, np.sign(mix) * limited, mix)
+    
+    def process_audio(self, audio_chunk):
+        """
+        Parameters:
+            audio_chunk (np.ndarray): (stems, frames) block
+
+        Returns:
+            np.ndarray: mono mix of the processed stems
+        """
+        processed = audio_chunk.copy()
+        
+        processed = self.apply_lowpass_filter(processed)
+        
+        processed = self.apply_distortion(processed)
+        
+        processed = self.apply_reverb(processed)
+        
+        processed = self.stem_gains @ processed
+        
+        # fixed level instead of per-block peak normalisation, so the send gains stay audible
+        processed = self.apply_limiter(processed)
+        
+        return processed
+    
+    def _render_block(self, frame_count):
+        length = self.audio_data.shape[1]
+        if self.current_position + frame_count < length:
+            audio_chunk = self.audio_data[:, self.current_position:self.current_position + frame_count]
+            self.current_position += frame_count
+        else:
+            remaining = length - self.current_position
+            audio_chunk = np.zeros((self.num_stems, frame_count))
+            if remaining > 0:
+                audio_chunk[:, :remaining] = self.audio_data[:, self.current_position:]
+            self.current_position = 0
+        
+        processed = self.process_audio(audio_chunk)
+
+        return np.broadcast_to(processed.astype(np.float32)[:, None], (frame_count, self.channels))
+    
+    def _fill(self):
+        """render blocks until the ring buffer holds ahead_blocks of audio"""
+        target = self.ahead_blocks * self.buffer_size
+        while self.ring.available() + self.buffer_size <= target:
+            self.ring.write(self._render_block(self.buffer_size))
+    
+    def _producer_loop(self):
+        block_time = self.buffer_size / self.sample_rate
+        last_underruns = self.underrun_count
+        last_underrun_time = time.time()
+        
+        while not self.stop_event.is_set():
+            # a late wake-up only matters once it has eaten the headroom
+            if self.ring.available() < self.buffer_size:
+                self.producer_late_count += 1
+            
+            # adaptive headroom: grow on underrun, shrink after a quiet period
+            if self.underrun_count != last_underruns:
+                last_underruns = self.underrun_count
+                last_underrun_time = time.time()
+                self.ahead_blocks = min(self.ahead_blocks + 1, self.max_ahead_blocks)
+            elif (self.ahead_blocks > self.min_ahead_blocks
+                  and time.time() - last_underrun_time > self.headroom_decay_time):
+                last_underrun_time = time.time()
+                self.ahead_blocks -= 1
+            
+            self._fill()
+            time.sleep(block_time / 2)
+    
+    def _audio_callback(self, out, underflow):
+        if self.stop_event.is_set():
+            return False
+        
+        start = time.perf_counter()
+        if self.last_callback_start is not None:
+            self.callback_interval_max = max(self.callback_interval_max, start - self.last_callback_start)
+        self.last_callback_start = start
+        
+        if not self.backend.realtime:
+            # offline rendering: the callback thread is the producer
+            self._fill()
+        
+        copied = self.ring.read_into(out)
+        if copied < len(out):
+            out[copied:] = 0
+            self.underrun_count += 1
+        elif underflow:
+            self.underrun_count += 1
+        
+        elapsed = time.perf_counter() - start
+        self.callback_count += 1
+        self.callback_time_total += elapsed
+        self.callback_time_max = max(self.callback_time_max, elapsed)
+        
+        return True
+    
+    def get_statistics(self):
+        callbacks = max(self.callback_count, 1)
+        return {
+            "underruns": self.underrun_count,
+            "producer_late": self.producer_late_count,
+            "ahead_blocks": self.ahead_blocks,
+            "buffered_ms": 1000.0 * self.ring.available() / self.sample_rate,
+            "callbacks": self.callback_count,
+            "callback_ms_avg": 1000.0 * self.callback_time_total / callbacks,
+            "callback_ms_max": 1000.0 * self.callback_time_max,
+            "callback_interval_ms_max": 1000.0 * self.callback_interval_max
+        }
+    
+    def reset_callback_timing(self):
+        """start a new window for the callback count/duration/interval statistics"""
+        self.callback_count = 0
+        self.callback_time_total = 0.0
+        self.callback_time_max = 0.0
+        self.callback_interval_max = 0.0
+        self.last_callback_start = None
+    
+    def play(self):
+        if self.is_playing:
+            return
+        
+        self.is_playing = True
+        self.stop_event.clear()
+        self.current_position = 0
+        
+        self.ring.clear()
+        self._fill()
+        if self.backend.realtime:
+            self.producer = Thread(target=self._producer_loop, daemon=True)
+            self.producer.start()
+        
+        self.backend.start(self._audio_callback)
+    
+    def stop(self):
+        if not self.is_playing:
+            return
+        
+        self.stop_event.set()
+        
+        if self.producer:
+            self.producer.join()
+            self.producer = None
+        
+        self.backend.stop()
+        
+        self.is_playing = False
+    
+    def release(self):
+        self.stop()
+        self.backend.close()
@@ -0,0 +1,259 @@
+import argparse
+import time
+from threading import Thread, Event
+from pythonosc import dispatcher, osc_server
+from audio_processor import AudioProcessor
+from audio_backends import BACKENDS
+from jitter_buffer import JitterBuffer
+
+EFFECTS = ['reverb', 'filter', 'distortion', 'gain']
+
+
+class OscControlServer:
+    """receives /mouth and /blendshape/* from the face tracker and drives an AudioProcessor"""
+
+    def __init__(self, audio_processor, ip="0.0.0.0", port=8000, delay=0.05,
+                 effect='reverb', effect_stems=None, send_stems=(), feature_map=None):
+        """
+        Incoming values go through a JitterBuffer and are applied by a pump
+        thread once per audio block, so the OSC thread never touches the
+        effect settings and uneven network delivery turns into a constant delay.
+
+        Parameters:
+            audio_processor (AudioProcessor)
+            ip (str): interface to listen on
+            port (int): UDP port
+            delay (float): playout delay in seconds
+            effect (str): effect /mouth controls, one of EFFECTS
+            effect_stems (list): stem indices /mouth and mapped features act on (None: all)
+            send_stems (list): stem indices whose send level follows /mouth
+            feature_map (dict): OSC address -> effect for other features (e.g. '/blendshape/jawOpen': 'filter')
+        """
+        self.audio_processor = audio_processor
+        self.effect = effect
+        self.effect_stems = effect_stems
+        self.send_stems = list(send_stems)
+        self.feature_map = dict(feature_map or {})
+        self.jitter_buffer = JitterBuffer(delay)
+        self.pump_interval = audio_processor.buffer_size / audio_processor.sample_rate
+        self.values = {}
+        self.invalid_count = 0
+
+        self.dispatcher = dispatcher.Dispatcher()
+        self.dispatcher.map("/mouth", self._on_message)
+        self.dispatcher.map("/blendshape/*", self._on_message)
+        for address in self.feature_map:
+            if address != "/mouth" and not address.startswith("/blendshape/"):
+                self.dispatcher.map(address, self._on_message)
+        self.server = osc_server.BlockingOSCUDPServer((ip, port), self.dispatcher)
+
+        self.stop_event = Event()
+        self.server_thread = None
+        self.pump_thread = None
+
+    def _on_message(self, address, *args):
+        """OSC thread: value[, send time] -> jitter buffer"""
+        try:
+            value = float(args[0])
+            sent_time = float(args[1]) if len(args) > 1 else None
+        except (IndexError, TypeError, ValueError):
+            self.invalid_count += 1
+            return
+        if address == "/mouth":
+            value /= 127.0
+        self.jitter_buffer.push(address, min(max(value, 0.0), 1.0), sent_time)
+
+    def _set_effect(self, effect, value, stems):
+        if effect == 'reverb':
+            self.audio_processor.set_reverb(value, stems)
+        elif effect == 'filter':
+            self.audio_processor.set_filter_cutoff(value, stems)
+        elif effect == 'distortion':
+            self.audio_processor.set_distortion(value, stems)
+        elif effect == 'gain':
+            self.audio_processor.set_stem_gain(value, stems)
+
+    def _apply(self, address, value):
+        if address == "/mouth":
+            self._set_effect(self.effect, value, self.effect_stems)
+            if self.send_stems:
+                self.audio_processor.set_stem_gain(value, self.send_stems)
+        effect = self.feature_map.get(address)
+        if effect:
+            stems = (self.send_stems or None) if effect == 'gain' else self.effect_stems
+            self._set_effect(effect, value, stems)
+        self.values[address] = value
+
+    def _pump_loop(self):
+        while not self.stop_event.is_set():
+            for address, value in self.jitter_buffer.pop_due().items():
+                self._apply(address, value)
+            self.stop_event.wait(self.pump_interval)
+
+    def start(self):
+        self.stop_event.clear()
+        self.server_thread = Thread(target=self.server.serve_forever, daemon=True)
+        self.server_thread.start()
+        self.pump_thread = Thread(target=self._pump_loop, daemon=True)
+        self.pump_thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.server_thread:
+            self.server.shutdown()
+            self.server_thread.join()
+            self.server_thread = None
+        if self.pump_thread:
+            self.pump_thread.join()
+            self.pump_thread = None
+        self.server.server_close()
+
+    def get_statistics(self):
+        stats = self.jitter_buffer.get_statistics()
+        stats["invalid"] = self.invalid_count
+        stats["values"] = dict(self.values)
+        return stats
+
+
+def parse_feature_map(entries):
+    """
+    Parameters:
+        entries (list): 'name=effect' strings, name is a blendshape or a full OSC address
+
+    Returns:
+        dict: OSC address -> effect
+    """
+    feature_map = {}
+    for entry in entries:
+        name, _, effect = entry.partition('=')
+        if not name or effect not in EFFECTS:
+            raise ValueError(f"Invalid feature mapping '{entry}', expected name=effect with effect in {EFFECTS}")
+        address = name if name.startswith('/') else f"/blendshape/{name}"
+        feature_map[address] = effect
+    return feature_map
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description='Audio-only effects engine controlled by face features over OSC')
+
+    parser.add_argument('--ip', type=str, default='0.0.0.0',
+                        help='Interface to listen on for OSC (default: 0.0.0.0)')
+    parser.add_argument('--port', type=int, default=8000,
+                        help='OSC port, the face tracker --port (default: 8000)')
+    parser.add_argument('--jitter-delay', type=float, default=50,
+                        help='Playout delay of incoming control values in ms (default: 50)')
+
+    parser.add_argument('--audio', type=str, nargs='+', required=True,
+                        help='Path to the WAV audio file, or several files played as stems')
+    parser.add_argument('--effect', type=str, default='reverb', choices=EFFECTS,
+                        help='Effect controlled by /mouth, gain is the level of --effect-stems (default: reverb)')
+    parser.add_argument('--map', type=str, nargs='*', default=[],
+                        help='Extra features as name=effect, e.g. mouthFunnel=distortion; gain sets the --send-stems level, '
+                             'or the master level without send stems (default: none)')
+    parser.add_argument('--effect-stems', type=int, nargs='*', default=None,
+                        help='Stem indices the controlled effects apply to (default: all)')
+    parser.add_argument('--send-stems', type=int, nargs='*', default=[],
+                        help='Stem indices whose send level follows the mouth (default: none)')
+
+    parser.add_argument('--buffer-size', type=int, default=1024,
+                        help='Audio buffer size (default: 1024)')
+    parser.add_argument('--ahead-blocks', type=int, default=4,
+                        help='Audio blocks rendered ahead of playback (default: 4)')
+    parser.add_argument('--max-ahead-blocks', type=int, default=16,
+                        help='Maximum render-ahead blocks after underruns (default: 16)')
+    parser.add_argument('--backend', type=str, default='pyaudio', choices=BACKENDS,
+                        help='Audio output backend (default: pyaudio)')
+    parser.add_argument('--output-file', type=str, default=None,
+                        help='WAV file written by the wav backend')
+    parser.add_argument('--channels', type=int, default=1,
+                        help='Output channels, the mix is copied to every channel (default: 1)')
+
+    parser.add_argument('--status-interval', type=float, default=5.0,
+                        help='Seconds between status lines, 0 to disable (default: 5)')
+
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+
+    try:
+        feature_map = parse_feature_map(args.map)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+
+    try:
+        audio_processor = AudioProcessor(
+            audio_file=args.audio,
+            buffer_size=args.buffer_size,
+            ahead_blocks=args.ahead_blocks,
+            max_ahead_blocks=args.max_ahead_blocks,
+            channels=args.channels,
+            backend=args.backend,
+            output_file=args.output_file
+        )
+    except Exception as e:
+        print(f"Error: cannot load audio: {e}")
+        return
+
+    for stem in (args.effect_stems or []) + args.send_stems:
+        if not 0 <= stem < audio_processor.num_stems:
+            print(f"Error: stem index {stem} out of range (0-{audio_processor.num_stems - 1})")
+            audio_processor.release()
+            return
+
+    try:
+        server = OscControlServer(
+            audio_processor,
+            ip=args.ip,
+            port=args.port,
+            delay=args.jitter_delay / 1000.0,
+            effect=args.effect,
+            effect_stems=args.effect_stems if args.effect_stems else None,
+            send_stems=args.send_stems,
+            feature_map=feature_map
+        )
+    except OSError as e:
+        print(f"Error: cannot listen on {args.ip}:{args.port}: {e}")
+        audio_processor.release()
+        return
+
+    print("OSC AUDIO SERVER:")
+    print(f"  - LISTENING: {args.ip}:{args.port} (/mouth, /blendshape/*)")
+    print(f"  - AUDIO FILE: {', '.join(args.audio)}")
+    print(f"  - /mouth -> {args.effect}" + (f", send stems {args.send_stems}" if args.send_stems else ""))
+    for address, effect in feature_map.items():
+        print(f"  - {address} -> {effect}")
+    print(f"  - JITTER DELAY: {args.jitter_delay:.0f}ms")
+    print(f"  - AUDIO OUTPUT: {args.backend}" + (f" ({args.output_file})" if args.output_file else ""))
+    print("Ctrl+C to quit")
+
+    audio_processor.play()
+    server.start()
+
+    try:
+        while True:
+            if args.status_interval <= 0:
+                time.sleep(1.0)
+                continue
+            time.sleep(args.status_interval)
+            stats = server.get_statistics()
+            audio_stats = audio_processor.get_statistics()
+            offset = f"{stats['offset_ms']:.1f}ms" if stats['offset_ms'] is not None else "-"
+            values = "  ".join(f"{address}={value:.2f}" for address, value in stats['values'].items())
+            print(f"OSC: {stats['received']} received, {stats['late']} late, {stats['reordered']} reordered, "
+                  f"offset {offset} | Underruns: {audio_stats['underruns']} Late: {audio_stats['producer_late']} "
+                  f"Ahead: {audio_stats['buffered_ms']:.0f}ms | {values}")
+
+    except KeyboardInterrupt:
+        print("quit program.")
+
+    finally:
+        server.stop()
+        audio_processor.release()
+        print("program finished.")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,8 @@ import numpy as np
 import time
 
 class FaceTracker:
-    def __init__(self, sensitivity=1.0, min_detection_confidence=0.5, min_tracking_confidence=0.5):
+    def __init__(self, sensitivity=1.0, min_detection_confidence=0.5, min_tracking_confidence=0.5,
+                 draw_debug=True):
         """
         Classes that detect face tracking and degree of mouth opening
 
@@ -12,8 +13,10 @@ class FaceTracker:
             sensitivity (float): open mouth sensitivity (the higher the sensitivity, the more sensitive it is)
             min_detection_confidence (float): Mediapipe Face Detection Reliability Threshold
             min_tracking_confidence (float): Mediapipe landmark tracking reliability threshold
+            draw_debug (bool): draw debug information on the returned frame (off when a PreviewRenderer draws it)
         """
         self.sensitivity = sensitivity
+        self.draw_debug = draw_debug
         
         # MediaPipe Face Mesh Reset
         self.mp_face_mesh = mp.solutions.face_mesh
@@ -25,6 +28,8 @@ class FaceTracker:
         )
         self.mp_drawing = mp.solutions.drawing_utils
         self.mp_drawing_styles = mp.solutions.drawing_styles
+        self.lip_connections = self.mp_face_mesh.FACEMESH_LIPS
+        self.mesh_connections = self.mp_face_mesh.FACEMESH_TESSELATION
         
         self.upper_lip_indices = [13] 
         self.lower_lip_indices = [14]  
@@ -34,6 +39,7 @@ class FaceTracker:
         self.mouth_closed_calibration = None
         self.last_mouth_value = 0
         self.is_calibrated = False
+        self.landmark_points = None
         
         self.last_process_time = time.time()
         self.frame_count = 0
@@ -56,6 +62,13 @@ class FaceTracker:
         self.mouth_open_calibration = None
         self.is_calibrated = False
     
+    def get_landmark_points(self):
+        """
+        Returns:
+            np.ndarray: (N, 2) normalized landmark positions of the last frame, or None without a face
+        """
+        return self.landmark_points
+
     def process_frame(self, frame):
         """
         Process video frames to calculate the degree of mouth opening
@@ -64,7 +77,7 @@ class FaceTracker:
             frame: Video frame to be processed (in BGR format)
 
         Returns:
-            processed_frame: frame with debug information added
+            processed_frame: frame with debug information added (the input frame when draw_debug is off)
             mouth_value: degree of mouth opening (0-127)
             success: face detection successful
         """
@@ -80,10 +93,11 @@ class FaceTracker:
         h, w, _ = frame.shape
         results = self.face_mesh.process(frame_rgb)
         
-        processed_frame = frame.copy()
+        processed_frame = frame.copy() if self.draw_debug else frame
         
         mouth_value = self.last_mouth_value
         success = False
+        self.landmark_points = None
         
         if results.multi_face_landmarks:
             face_landmarks = results.multi_face_landmarks[0]
@@ -104,14 +118,17 @@ class FaceTracker:
             mapped_value = np.interp(adjusted_gap, [min_gap, max_gap], [0, 127])
             mouth_value = int(np.clip(mapped_value, 0, 127))
             self.last_mouth_value = mouth_value
+            self.landmark_points = np.array([(lm.x, lm.y) for lm in face_landmarks.landmark])
             success = True
             
-            self._draw_debug_info(processed_frame, face_landmarks, mouth_value, mouth_gap)
-        
-        cv2.putText(processed_frame, f"FPS: {self.fps:.1f}", (10, 30), 
-                    cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
-        cv2.putText(processed_frame, f"Mouth: {mouth_value}", (10, 70), 
-                    cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
+            if self.draw_debug:
+                self._draw_debug_info(processed_frame, face_landmarks, mouth_value, mouth_gap)
+        
+        if self.draw_debug:
+            cv2.putText(processed_frame, f"FPS: {self.fps:.1f}", (10, 30), 
+                        cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
+            cv2.putText(processed_frame, f"Mouth: {mouth_value}", (10, 70), 
+                        cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
         
         return processed_frame, mouth_value, success
     
@@ -0,0 +1,94 @@
+import heapq
+import threading
+import time
+from collections import deque
+
+
+class JitterBuffer:
+    """timestamped control events, released after a fixed playout delay"""
+
+    def __init__(self, delay=0.05, offset_window=256):
+        """
+        Events that carry the sender's send time are scheduled at
+        send time + clock offset + delay. The clock offset is the smallest
+        (arrival - send time) seen over the last offset_window events, i.e. the
+        fastest network path plus the difference between the two clocks, so the
+        hosts do not need synchronised clocks. Events without a send time are
+        scheduled at arrival + delay.
+
+        Parameters:
+            delay (float): playout delay in seconds, should cover the network jitter
+            offset_window (int): number of recent events the clock offset is estimated from
+        """
+        self.delay = delay
+        self.offsets = deque(maxlen=offset_window)
+        self.lock = threading.Lock()
+        self.queue = []
+        self.sequence = 0
+        self.last_sent = {}
+
+        self.received = 0
+        self.late = 0
+        self.reordered = 0
+
+    def push(self, address, value, sent_time=None):
+        """
+        Parameters:
+            address (str): OSC address of the control value
+            value (float)
+            sent_time (float): sender's time.time() when the value was sent, or None
+
+        Returns:
+            bool: False when the event was dropped because a newer one was already received
+        """
+        arrival = time.time()
+        with self.lock:
+            self.received += 1
+            if sent_time is None:
+                due = arrival + self.delay
+            else:
+                if sent_time <= self.last_sent.get(address, float('-inf')):
+                    self.reordered += 1
+                    return False
+                self.last_sent[address] = sent_time
+                self.offsets.append(arrival - sent_time)
+                due = sent_time + min(self.offsets) + self.delay
+                if due < arrival:
+                    self.late += 1
+                    due = arrival
+            heapq.heappush(self.queue, (due, self.sequence, address, value))
+            self.sequence += 1
+        return True
+
+    def pop_due(self, now=None):
+        """
+        Parameters:
+            now (float): time.time() to release events up to (default: now)
+
+        Returns:
+            dict: address -> latest due value, earlier values for the same address are skipped
+        """
+        if now is None:
+            now = time.time()
+        values = {}
+        with self.lock:
+            while self.queue and self.queue[0][0] <= now:
+                _, _, address, value = heapq.heappop(self.queue)
+                values[address] = value
+        return values
+
+    def clear(self):
+        with self.lock:
+            self.queue = []
+            self.offsets.clear()
+            self.last_sent = {}
+
+    def get_statistics(self):
+        with self.lock:
+            return {
+                "received": self.received,
+                "late": self.late,
+                "reordered": self.reordered,
+                "queued": len(self.queue),
+                "offset_ms": min(self.offsets) * 1000 if self.offsets else None
+            }
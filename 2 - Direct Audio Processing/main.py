@@ -8,157 +8,14 @@ import librosa
 import threading
 import queue
 from face_tracker import FaceTracker
-from scipy.signal import lfilter
-import pyaudio
+from preview_renderer import PreviewRenderer
+from audio_processor import AudioProcessor
+from audio_backends import BACKENDS
 import wave
 import numpy as np
 from queue import Queue
 from threading import Thread, Event
 
-class AudioProcessor:
-    """processes audio files and applies real-time effects"""
-    
-    def __init__(self, audio_file, buffer_size=1024, sample_rate=44100):
-        """
-        Parameters:
-            audio_file (str)
-            buffer_size (int)
-            sample_rate (int)
-        """
-        self.audio_file = audio_file
-        self.buffer_size = buffer_size
-        self.sample_rate = sample_rate
-        
-        self.audio_data, self.sample_rate = sf.read(audio_file)
-        
-        if len(self.audio_data.shape) > 1 and self.audio_data.shape[1] > 1:
-            self.audio_data = np.mean(self.audio_data, axis=1)
-        
-        self.reverb_amount = 0.0
-        self.filter_cutoff = 0.5
-        self.distortion_amount = 0.0
-        
-        self.audio_queue = Queue()
-        self.stop_event = Event()
-        self.is_playing = False
-        self.current_position = 0
-        
-        self.p = pyaudio.PyAudio()
-        self.stream = None
-        
-    def set_reverb(self, amount):
-        self.reverb_amount = np.clip(amount, 0.0, 1.0)
-        
-    def set_filter_cutoff(self, amount):
-        self.filter_cutoff = np.clip(amount, 0.0, 1.0)
-        
-    def set_distortion(self, amount):
-        self.distortion_amount = np.clip(amount, 0.0, 1.0)
-    
-    def apply_reverb(self, audio_chunk):
-        if self.reverb_amount <= 0:
-            return audio_chunk
-        
-        delay_samples = int(self.sample_rate * 0.1 * self.reverb_amount)
-        if delay_samples <= 0:
-            return audio_chunk
-        
-        decay = 0.6 * self.reverb_amount
-        
-        delayed = np.zeros_like(audio_chunk)
-        if delay_samples < len(audio_chunk):
-            delayed[delay_samples:] = audio_chunk[:-delay_samples] * decay
-        
-        return audio_chunk + delayed
-    
-    def apply_lowpass_filter(self, audio_chunk):
-        if self.filter_cutoff >= 1.0:
-            return audio_chunk
-        
-        cutoff = 0.1 + 0.8 * self.filter_cutoff
-        b = [1 - cutoff]
-        a = [1, -cutoff]
-        return lfilter(b, a, audio_chunk)
-    
-    def apply_distortion(self, audio_chunk):
-        if self.distortion_amount <= 0:
-            return audio_chunk
-        
-        gain = 1.0 + 4.0 * self.distortion_amount
-        return np.tanh(audio_chunk * gain) / gain
-    
-    def process_audio(self, audio_chunk):
-        processed = audio_chunk.copy()
-        
-        processed = self.apply_lowpass_filter(processed)
-        
-        processed = self.apply_distortion(processed)
-        
-        processed = self.apply_reverb(processed)
-        
-        if np.max(np.abs(processed)) > 0:
-            processed = processed / np.max(np.abs(processed))
-        
-        return processed
-    
-    def _audio_callback(self, in_data, frame_count, time_info, status):
-        if self.stop_event.is_set():
-            return (None, pyaudio.paComplete)
-        
-        if self.current_position + frame_count < len(self.audio_data):
-            audio_chunk = self.audio_data[self.current_position:self.current_position + frame_count]
-            self.current_position += frame_count
-        else:
-            remaining = len(self.audio_data) - self.current_position
-            audio_chunk = np.zeros(frame_count)
-            if remaining > 0:
-                audio_chunk[:remaining] = self.audio_data[self.current_position:]
-            self.current_position = 0
-        
-        processed = self.process_audio(audio_chunk)
-
-        out_data = (processed * 32767).astype(np.int16).tobytes()
-        
-        return (out_data, pyaudio.paContinue)
-    
-    def play(self):
-        if self.is_playing:
-            return
-        
-        self.is_playing = True
-        self.stop_event.clear()
-        self.current_position = 0
-        
-        self.stream = self.p.open(
-            format=pyaudio.paInt16,
-            channels=1,
-            rate=self.sample_rate,
-            output=True,
-            frames_per_buffer=self.buffer_size,
-            stream_callback=self._audio_callback
-        )
-        
-        self.stream.start_stream()
-    
-    def stop(self):
-        if not self.is_playing:
-            return
-        
-        self.stop_event.set()
-        
-        if self.stream:
-            self.stream.stop_stream()
-            self.stream.close()
-            self.stream = None
-        
-        self.is_playing = False
-    
-    def release(self):
-        self.stop()
-        if self.p:
-            self.p.terminate()
-
-
 def parse_arguments():
     parser = argparse.ArgumentParser(description='Control audio effects with mouth shape')
     
@@ -173,15 +30,36 @@ def parse_arguments():
     parser.add_argument('--sensitivity', type=float, default=1.0,
                         help='Mouth Sensitivity (default: 1.0)')   
 
-    parser.add_argument('--audio', type=str, required=True,
-                        help='Audio file path to be processed (.wav file)')
+    parser.add_argument('--audio', type=str, nargs='+', required=True,
+                        help='Audio file path to be processed (.wav file), several files are mixed as stems')
+    parser.add_argument('--effect-stems', type=int, nargs='*', default=None,
+                        help='Stem indices the mouth-controlled effect applies to (default: all)')
+    parser.add_argument('--send-stems', type=int, nargs='*', default=[],
+                        help='Stem indices whose send level follows the mouth (default: none)')
     parser.add_argument('--buffer-size', type=int, default=1024,
                         help='Audio buffer size (default: 1024)')
+    parser.add_argument('--ahead-blocks', type=int, default=4,
+                        help='Audio blocks rendered ahead of playback (default: 4)')
+    parser.add_argument('--max-ahead-blocks', type=int, default=16,
+                        help='Maximum render-ahead blocks after underruns (default: 16)')
+    parser.add_argument('--backend', type=str, default='pyaudio', choices=BACKENDS,
+                        help='Audio output backend (default: pyaudio)')
+    parser.add_argument('--output-file', type=str, default=None,
+                        help='WAV file written by the wav backend')
+    parser.add_argument('--channels', type=int, default=1,
+                        help='Output channels (default: 1)')
     
     parser.add_argument('--effect', type=str, default='reverb',
                         choices=['reverb', 'filter', 'distortion'],
                         help='control the shape (default: Reverb)')
     
+    parser.add_argument('--preview-fps', type=float, default=15,
+                        help='Maximum preview frame rate (default: 15)')
+    parser.add_argument('--preview-scale', type=float, default=0.5,
+                        help='Preview size relative to the camera frame (default: 0.5)')
+    parser.add_argument('--preview-mode', type=str, default='full', choices=['full', 'minimal'],
+                        help='Preview overlay: full (mesh, lips, meter, text) or minimal (lips and meter) (default: full)')
+    
     return parser.parse_args()
 
 
@@ -199,29 +77,56 @@ def main():
     face_tracker = FaceTracker(
         sensitivity=args.sensitivity,
         min_detection_confidence=0.5,
-        min_tracking_confidence=0.5
+        min_tracking_confidence=0.5,
+        draw_debug=False
     )
     
     try:
         audio_processor = AudioProcessor(
             audio_file=args.audio,
-            buffer_size=args.buffer_size
+            buffer_size=args.buffer_size,
+            ahead_blocks=args.ahead_blocks,
+            max_ahead_blocks=args.max_ahead_blocks,
+            channels=args.channels,
+            backend=args.backend,
+            output_file=args.output_file
         )
     except Exception as e:
         print(f"Error: cannot load audio: {e}")
         cap.release()
         return
     
+    for stem in (args.effect_stems or []) + args.send_stems:
+        if not 0 <= stem < audio_processor.num_stems:
+            print(f"Error: stem index {stem} out of range (0-{audio_processor.num_stems - 1})")
+            audio_processor.release()
+            cap.release()
+            return
+    effect_stems = args.effect_stems if args.effect_stems else None
+    send_stems = args.send_stems
+    
     print(f"CONTROL {args.effect} WITH YOUR MOUTH:")
     print(f"  - CAMERA: {args.camera}")
-    print(f"  - AUDIO FILE: {args.audio}")
+    print(f"  - AUDIO FILE: {', '.join(args.audio)}")
+    if audio_processor.num_stems > 1:
+        print(f"  - STEMS: {audio_processor.num_stems} (effect: {effect_stems if effect_stems else 'all'}, send: {send_stems if send_stems else 'none'})")
     print(f"  - EFFECT MODE: {args.effect}")
+    print(f"  - AUDIO OUTPUT: {args.backend}" + (f" ({args.output_file})" if args.output_file else ""))
     print("'q' for quit program, 'p'for audio pause/play, 'r' for reset calibration")
     
     calibration_mode = False
     calibration_step = 0
     mouth_closed_value = None
     
+    preview = PreviewRenderer(
+        fps=args.preview_fps,
+        scale=args.preview_scale,
+        mode=args.preview_mode,
+        lip_connections=face_tracker.lip_connections,
+        mesh_connections=face_tracker.mesh_connections
+    )
+    preview.start()
+    
     audio_processor.play()
     is_paused = False
     
@@ -234,37 +139,40 @@ def main():
             
             processed_frame, mouth_value, success = face_tracker.process_frame(frame)
             
+            prompt = None
             if calibration_mode:
                 if calibration_step == 0:
-                    cv2.putText(processed_frame, "Close your mouth and press 'c'", 
-                                (50, 120), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
+                    prompt = "Close your mouth and press 'c'"
                 elif calibration_step == 1:
-                    cv2.putText(processed_frame, "Open your mouth wide and press 'c'", 
-                                (50, 120), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
+                    prompt = "Open your mouth wide and press 'c'"
+            
+            audio_stats = audio_processor.get_statistics()
+            status = "pause" if is_paused else "playing"
+            lines = [f"FPS: {face_tracker.fps:.1f}",
+                     f"Underruns: {audio_stats['underruns']} Late: {audio_stats['producer_late']}  "
+                     f"Ahead: {audio_stats['buffered_ms']:.0f}ms",
+                     f"Status: {status}"]
             
             if success:
                 normalized_value = mouth_value / 127.0
                 
                 if args.effect == 'reverb':
-                    audio_processor.set_reverb(normalized_value)
+                    audio_processor.set_reverb(normalized_value, effect_stems)
                     effect_name = "reverb"
                 elif args.effect == 'filter':
-                    audio_processor.set_filter_cutoff(normalized_value)
+                    audio_processor.set_filter_cutoff(normalized_value, effect_stems)
                     effect_name = "filter"
                 elif args.effect == 'distortion':
-                    audio_processor.set_distortion(normalized_value)
+                    audio_processor.set_distortion(normalized_value, effect_stems)
                     effect_name = "distortion"
                 
-                cv2.putText(processed_frame, f"{effect_name}: {normalized_value:.2f}", 
-                            (10, processed_frame.shape[0] - 40), 
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
-            
-            status = "pause" if is_paused else "playing"
-            cv2.putText(processed_frame, f"Status: {status}", 
-                        (10, processed_frame.shape[0] - 70), 
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
+                if send_stems:
+                    audio_processor.set_stem_gain(normalized_value, send_stems)
+                
+                lines.append(f"{effect_name}: {normalized_value:.2f}")
             
-            cv2.imshow('Control Audio Effects with your mouth', processed_frame)
+            preview.submit(processed_frame, face_tracker.get_landmark_points(), mouth_value, lines, prompt)
+            preview.show('Control Audio Effects with your mouth')
             
             key = cv2.waitKey(1) & 0xFF
             
@@ -312,6 +220,7 @@ def main():
         print("quit program.")
     
     finally:
+        preview.stop()
         audio_processor.release()
         cap.release()
         face_tracker.release()
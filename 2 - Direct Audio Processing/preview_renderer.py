@@ -0,0 +1,164 @@
+import cv2
+import numpy as np
+import threading
+import time
+
+
+class PreviewRenderer:
+    def __init__(self, fps=15, scale=0.5, mode="full", lip_connections=None, mesh_connections=None):
+        """
+        Preview window renderer that runs beside the tracking loop
+
+        The tracking loop only hands over references with submit(). A render
+        thread scales the latest frame down and draws the overlay at its own
+        capped rate, and show() displays a finished frame only when a new one
+        is ready. Static parts of the overlay (meter background) are drawn
+        once per preview size and pasted in.
+
+        Parameters:
+            fps (float): maximum preview frame rate
+            scale (float): preview size relative to the camera frame
+            mode (str): 'full' (face mesh, lips, meter, text) or 'minimal' (lips and meter)
+            lip_connections: landmark index pairs of the lip contour
+            mesh_connections: landmark index pairs of the face mesh tesselation
+        """
+        if mode not in ("full", "minimal"):
+            raise ValueError(f"Unknown preview mode: {mode}")
+
+        self.interval = 1.0 / fps if fps > 0 else 0
+        self.scale = scale
+        self.mode = mode
+        self.lip_connections = self._edges(lip_connections)
+        self.mesh_connections = self._edges(mesh_connections)
+
+        self.lock = threading.Lock()
+        self.pending = None
+        self.composed = None
+        self.composed_id = 0
+        self.shown_id = 0
+        self.new_submission = threading.Event()
+        self.stop_event = threading.Event()
+        self.thread = None
+
+        # static overlay cache, rebuilt only when the preview size changes
+        self.cached_size = None
+        self.meter_patch = None
+        self.meter_origin = None
+        self.meter_width = 0
+        self.meter_height = 0
+
+    def _edges(self, connections):
+        if connections is None:
+            return None
+        return np.array(sorted(connections), dtype=np.int32)
+
+    def start(self):
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def submit(self, frame, points, mouth_value, lines=(), prompt=None):
+        """
+        Hand over the latest state, called from the tracking loop (no drawing here)
+
+        Parameters:
+            frame: camera frame (BGR), not modified
+            points (np.ndarray): (N, 2) normalized landmarks, or None without a face
+            mouth_value (int): (0-127)
+            lines (list): status text lines, drawn bottom-left in full mode
+            prompt (str): calibration prompt, drawn in every mode
+        """
+        with self.lock:
+            self.pending = (frame, points, mouth_value, list(lines), prompt)
+        self.new_submission.set()
+
+    def show(self, window_name):
+        """Display the newest composed frame, must be called from the main thread"""
+        with self.lock:
+            composed, composed_id = self.composed, self.composed_id
+        if composed is not None and composed_id != self.shown_id:
+            self.shown_id = composed_id
+            cv2.imshow(window_name, composed)
+
+    def _run(self):
+        next_time = time.perf_counter()
+        while not self.stop_event.is_set():
+            if not self.new_submission.wait(0.1):
+                continue
+            delay = next_time - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            next_time = time.perf_counter() + self.interval
+
+            self.new_submission.clear()
+            with self.lock:
+                pending = self.pending
+            if pending is None or self.stop_event.is_set():
+                continue
+            composed = self._render(*pending)
+            with self.lock:
+                self.composed = composed
+                self.composed_id += 1
+
+    def _build_static_layers(self, w, h):
+        """meter background, drawn once per preview size"""
+        self.meter_width = max(8, w // 20)
+        self.meter_height = max(20, int(h * 0.4))
+        patch = np.zeros((self.meter_height + 2, self.meter_width + 2, 3), dtype=np.uint8)
+        patch[:] = (40, 40, 40)
+        patch[1:-1, 1:-1] = (100, 100, 100)
+        self.meter_patch = patch
+        self.meter_origin = (w - self.meter_width - 10, h // 10)
+        self.cached_size = (w, h)
+
+    def _draw_edges(self, image, pixels, edges, color):
+        segments = pixels[edges]
+        cv2.polylines(image, segments, False, color, 1, cv2.LINE_8)
+
+    def _render(self, frame, points, mouth_value, lines, prompt):
+        h, w = frame.shape[:2]
+        pw, ph = max(1, int(w * self.scale)), max(1, int(h * self.scale))
+        if (pw, ph) == (w, h):
+            image = frame.copy()
+        else:
+            image = cv2.resize(frame, (pw, ph), interpolation=cv2.INTER_AREA)
+
+        if self.cached_size != (pw, ph):
+            self._build_static_layers(pw, ph)
+
+        if points is not None:
+            pixels = (points * (pw, ph)).astype(np.int32)
+            if self.mode == "full" and self.mesh_connections is not None:
+                self._draw_edges(image, pixels, self.mesh_connections, (80, 80, 80))
+            if self.lip_connections is not None:
+                self._draw_edges(image, pixels, self.lip_connections, (0, 0, 255))
+
+        # meter: paste the cached background, then fill the value
+        x, y = self.meter_origin
+        mh, mw = self.meter_patch.shape[:2]
+        if x >= 0 and y + mh <= ph:
+            image[y:y + mh, x:x + mw] = self.meter_patch
+            value_height = int((mouth_value / 127) * self.meter_height)
+            if value_height > 0:
+                image[y + 1 + self.meter_height - value_height:y + 1 + self.meter_height,
+                      x + 1:x + 1 + self.meter_width] = (0, 255, 0)
+
+        if self.mode == "full":
+            cv2.putText(image, f"Mouth: {mouth_value}", (10, 25),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 1)
+            for i, line in enumerate(reversed(lines)):
+                cv2.putText(image, line, (10, ph - 15 - 22 * i),
+                            cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+
+        if prompt:
+            cv2.putText(image, prompt, (10, 55),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 255), 2)
+
+        return image
+
+    def stop(self):
+        self.stop_event.set()
+        self.new_submission.set()
+        if self.thread:
+            self.thread.join()
+            self.thread = None
@@ -0,0 +1,64 @@
+import numpy as np
+
+
+class RingBuffer:
+    """single-producer / single-consumer ring buffer over a preallocated array"""
+
+    def __init__(self, capacity, channels=1, dtype=np.int16):
+        """
+        Only the producer moves write_index and only the consumer moves
+        read_index, so the two threads never need a lock.
+
+        Parameters:
+            capacity (int): size in frames
+            channels (int)
+            dtype: sample type
+        """
+        self.capacity = capacity
+        self.buffer = np.zeros((capacity, channels), dtype=dtype)
+        self.write_index = 0
+        self.read_index = 0
+
+    def available(self):
+        """frames ready to be read"""
+        return self.write_index - self.read_index
+
+    def free(self):
+        """frames that can be written without overwriting unread data"""
+        return self.capacity - self.available()
+
+    def write(self, data):
+        """
+        Parameters:
+            data (np.ndarray): (frames, channels) block
+
+        Returns:
+            int: frames written, less than len(data) when the buffer is full
+        """
+        frames = min(len(data), self.free())
+        start = self.write_index % self.capacity
+        first = min(frames, self.capacity - start)
+        self.buffer[start:start + first] = data[:first]
+        self.buffer[:frames - first] = data[first:frames]
+        # publish only after the copy is complete
+        self.write_index += frames
+        return frames
+
+    def read_into(self, out):
+        """
+        Parameters:
+            out (np.ndarray): (frames, channels) destination
+
+        Returns:
+            int: frames copied, less than len(out) on underrun
+        """
+        frames = min(len(out), self.available())
+        start = self.read_index % self.capacity
+        first = min(frames, self.capacity - start)
+        out[:first] = self.buffer[start:start + first]
+        out[first:frames] = self.buffer[:frames - first]
+        self.read_index += frames
+        return frames
+
+    def clear(self):
+        self.read_index = self.write_index
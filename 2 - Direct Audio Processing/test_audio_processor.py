@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+import soundfile as sf
+from audio_processor import AudioProcessor
+
+SAMPLE_RATE = 44100
+
+
+@pytest.fixture
+def make_processor(tmp_path):
+    """AudioProcessor on the null backend with sine stems at 110, 330, ... Hz"""
+    processors = []
+
+    def make(num_stems):
+        t = np.arange(SAMPLE_RATE) / SAMPLE_RATE
+        paths = []
+        for i in range(num_stems):
+            path = tmp_path / f"stem_{i}.wav"
+            sf.write(path, 0.4 * np.sin(2 * np.pi * 110.0 * (2 * i + 1) * t), SAMPLE_RATE)
+            paths.append(str(path))
+        processor = AudioProcessor(paths, backend='null')
+        processors.append(processor)
+        return processor
+
+    yield make
+    for processor in processors:
+        processor.release()
+
+
+def rms(signal):
+    return float(np.sqrt(np.mean(signal ** 2)))
+
+
+def render(processor, gains):
+    processor.stem_gains[:] = gains
+    return processor.process_audio(processor.audio_data)
+
+
+def test_single_stem_send_sets_level(make_processor):
+    processor = make_processor(1)
+    full = rms(render(processor, [1.0]))
+
+    for gain in (0.5, 0.1, 0.01):
+        assert rms(render(processor, [gain])) == pytest.approx(gain * full, rel=0.05)
+    assert rms(render(processor, [0.0])) == 0.0
+
+
+@pytest.mark.parametrize("stem", [0, 1])
+def test_lowering_a_send_lowers_only_that_stem(make_processor, stem):
+    processor = make_processor(2)
+    levels = {}
+    for gain in (0.0, 0.5, 1.0):
+        gains = np.ones(2)
+        gains[stem] = gain
+        levels[gain] = render(processor, gains)
+
+    # the stem's contribution is the mix minus the mix without it
+    full = rms(levels[1.0] - levels[0.0])
+    half = rms(levels[0.5] - levels[0.0])
+    assert half == pytest.approx(0.5 * full, rel=0.05)
+
+    # the rest of the mix does not change, so the mix is linear in the send
+    deviation = rms(levels[0.5] - 0.5 * (levels[0.0] + levels[1.0]))
+    assert deviation < 0.05 * full
+
+
+def test_all_sends_act_as_master_level(make_processor):
+    processor = make_processor(2)
+    full = rms(render(processor, [1.0, 1.0]))
+
+    assert rms(render(processor, [0.5, 0.5])) == pytest.approx(0.5 * full, rel=0.05)
+
+
+def test_limiter_keeps_mix_within_full_scale(make_processor):
+    processor = make_processor(2)
+    processor.set_reverb(1.0)
+
+    assert np.max(np.abs(render(processor, [1.0, 1.0]))) <= 1.0
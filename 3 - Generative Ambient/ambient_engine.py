@@ -0,0 +1,152 @@
+import numpy as np
+from scipy.signal import lfilter
+
+# sequencer voices of experiment-2.pd: loop length = base + random(range),
+# note length = base + random(range), all in milliseconds
+PATCH_VOICES = [
+    {"loop_base": 5000, "loop_range": 1000, "note_base": 1000, "note_range": 500},
+    {"loop_base": 10000, "loop_range": 1000, "note_base": 1000, "note_range": 500},
+    {"loop_base": 10000, "loop_range": 1000, "note_base": 1000, "note_range": 500},
+    {"loop_base": 5000, "loop_range": 30000, "note_base": 1000, "note_range": 500},
+    {"loop_base": 5000, "loop_range": 1000, "note_base": 300, "note_range": 500},
+    {"loop_base": 5000, "loop_range": 1000, "note_base": 1000, "note_range": 500},
+    {"loop_base": 5000, "loop_range": 1000, "note_base": 1000, "note_range": 500},
+]
+
+# notes are typed into the patch by hand, so the port draws them from a scale
+DEFAULT_SCALE = [45, 48, 50, 52, 55, 57, 60, 62, 64, 67, 69]
+
+
+def mtof(note):
+    return 440.0 * 2.0 ** ((np.asarray(note, dtype=np.float64) - 69.0) / 12.0)
+
+
+class AmbientEngine:
+    """block-based NumPy port of the experiment-2 generative ambient patch"""
+
+    def __init__(self, sample_rate=44100, block_size=512, num_voices=7, seed=None,
+                 voices=None, notes=None, cutoff=6000.0):
+        """
+        Every voice is metro -> (line 0.1 300, delay note -> line 0 700) and
+        mtof -> phasor~ -> lop~ -> *~ envelope, summed like throw~/catch~ out.
+        All voices are rendered together as (voices x samples) arrays.
+
+        Parameters:
+            sample_rate (int)
+            block_size (int): default number of samples per render() call
+            num_voices (int): number of sequencer voices, the 7 patch voices are repeated beyond 7
+            seed (int): random seed for loop/note lengths and notes
+            voices (list): loop/note length dicts (Default: PATCH_VOICES)
+            notes (list): MIDI note per voice (Default: random from DEFAULT_SCALE)
+            cutoff (float): lop~ cutoff frequency in Hz
+        """
+        self.sample_rate = sample_rate
+        self.block_size = block_size
+        self.num_voices = num_voices
+        self.cutoff = cutoff
+        self.rng = np.random.default_rng(seed)
+
+        templates = voices or PATCH_VOICES
+        specs = [templates[i % len(templates)] for i in range(num_voices)]
+        self.loop_base = np.array([s["loop_base"] for s in specs], dtype=np.float64)
+        self.loop_range = np.array([s["loop_range"] for s in specs], dtype=np.float64)
+        self.note_base = np.array([s["note_base"] for s in specs], dtype=np.float64)
+        self.note_range = np.array([s["note_range"] for s in specs], dtype=np.float64)
+
+        # envelope of the patch: "0.1 300" on each tick, "0 700" after the note length
+        self.peak = 0.1 * min(1.0, 7.0 / num_voices)
+        self.attack_samples = 0.3 * sample_rate
+        self.release_samples = 0.7 * sample_rate
+
+        if notes is None:
+            notes = self.rng.choice(DEFAULT_SCALE, size=num_voices)
+        self.set_notes(notes)
+
+        self.position = 0
+        self.onset = np.zeros(num_voices, dtype=np.int64)
+        self.loop_samples = np.zeros(num_voices, dtype=np.int64)
+        self.note_samples = np.zeros(num_voices, dtype=np.int64)
+        self.phase = np.zeros(num_voices)
+        self.filter_state = np.zeros((num_voices, 1))
+        self.randomize()
+
+        # the three osc~ voices driven by the face blob (x, y, size) * 440
+        self.face_freqs = None
+        self.face_phase = np.zeros(3)
+        self.face_gain = 0.05
+        self.mouth = None
+
+    def set_notes(self, notes):
+        self.notes = np.asarray(notes, dtype=np.float64)
+        self.freqs = mtof(self.notes)
+
+    def randomize(self):
+        """Draw new loop and note lengths, like the 'randomize' bang of the patch"""
+        loop_ms = self.loop_base + self.rng.integers(0, self.loop_range)
+        note_ms = self.note_base + self.rng.integers(0, self.note_range)
+        loop_samples = (loop_ms * self.sample_rate / 1000).astype(np.int64)
+        note_samples = (note_ms * self.sample_rate / 1000).astype(np.int64)
+
+        # keep each metro running from its last tick, fire now if the new loop already elapsed
+        elapsed = self.position - self.onset
+        if self.loop_samples.any():
+            elapsed = elapsed % self.loop_samples
+        self.onset = np.where(elapsed < loop_samples, self.position - elapsed, self.position)
+
+        self.loop_samples = loop_samples
+        self.note_samples = note_samples
+
+    def set_face(self, x, y, size):
+        """Face blob in the form of pix_blob (0.0-1.0), drives the three osc~ voices"""
+        self.face_freqs = np.array([x, y, size], dtype=np.float64) * 440.0
+
+    def clear_face(self):
+        self.face_freqs = None
+
+    def set_mouth(self, amount):
+        """Mouth openness (0.0-1.0) opens the lop~ cutoff from 300 Hz up to the patch cutoff"""
+        self.mouth = None if amount is None else float(np.clip(amount, 0.0, 1.0))
+
+    def _envelope(self, elapsed):
+        note = self.note_samples[:, None]
+        attack = self.peak * np.minimum(elapsed / self.attack_samples, 1.0)
+        sustain = self.peak * np.minimum(note / self.attack_samples, 1.0)
+        release = sustain * np.maximum(1.0 - (elapsed - note) / self.release_samples, 0.0)
+        return np.where(elapsed < note, attack, release)
+
+    def render(self, frames=None):
+        """
+        Render the next block
+
+        Parameters:
+            frames (int): number of samples (Default: block_size)
+
+        Returns:
+            np.ndarray: float32 mono block
+        """
+        frames = frames or self.block_size
+        sr = self.sample_rate
+        ramp = np.arange(1, frames + 1)
+
+        samples = self.position + np.arange(frames)
+        elapsed = (samples[None, :] - self.onset[:, None]) % self.loop_samples[:, None]
+        envelope = self._envelope(elapsed)
+
+        # phasor~, centred to drop the DC offset the patch sends to dac~
+        phases = (self.phase[:, None] + (self.freqs / sr)[:, None] * ramp) % 1.0
+        self.phase = phases[:, -1]
+
+        cutoff = self.cutoff if self.mouth is None else 300.0 + self.mouth * (self.cutoff - 300.0)
+        k = min(2 * np.pi * cutoff / sr, 1.0)
+        filtered, self.filter_state = lfilter([k], [1.0, k - 1.0], phases - 0.5,
+                                              axis=1, zi=self.filter_state)
+
+        out = np.sum(filtered * envelope, axis=0)
+
+        if self.face_freqs is not None:
+            face_phases = self.face_phase[:, None] + (self.face_freqs / sr)[:, None] * ramp
+            self.face_phase = face_phases[:, -1] % 1.0
+            out += self.face_gain * np.sum(np.cos(2 * np.pi * face_phases), axis=0)
+
+        self.position += frames
+        return np.clip(out, -1.0, 1.0).astype(np.float32)
@@ -0,0 +1,151 @@
+import argparse
+import socket
+import threading
+import time
+import numpy as np
+import soundfile as sf
+from ambient_engine import AmbientEngine
+
+
+class FudiListener:
+    """receives the 'blob x y size;' / 'mouth value;' stream sent to experiment-2.pd"""
+
+    def __init__(self, engine, port=3000):
+        self.engine = engine
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(("0.0.0.0", port))
+        self.sock.settimeout(0.2)
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def _run(self):
+        while not self.stop_event.is_set():
+            try:
+                data, _ = self.sock.recvfrom(4096)
+            except socket.timeout:
+                continue
+            for message in data.decode("ascii", errors="ignore").split(";"):
+                atoms = message.split()
+                if not atoms:
+                    continue
+                try:
+                    if atoms[0] == "blob" and len(atoms) == 4:
+                        self.engine.set_face(*map(float, atoms[1:]))
+                    elif atoms[0] == "mouth" and len(atoms) == 2:
+                        self.engine.set_mouth(float(atoms[1]) / 127.0)
+                except ValueError:
+                    continue
+
+    def stop(self):
+        self.stop_event.set()
+        self.thread.join()
+        self.sock.close()
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description='Headless generative ambient engine (experiment-2 port)')
+
+    parser.add_argument('--output', type=str, default=None,
+                        help='Render to this WAV file faster than real time instead of playing')
+    parser.add_argument('--duration', type=float, default=60.0,
+                        help='Seconds to render to file (default: 60)')
+
+    parser.add_argument('--voices', type=int, default=7,
+                        help='Number of sequencer voices (default: 7)')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='Random seed for loop/note lengths and notes (default: random)')
+    parser.add_argument('--notes', type=int, nargs='*', default=None,
+                        help='MIDI note per voice (default: random from a pentatonic scale)')
+    parser.add_argument('--sample-rate', type=int, default=44100,
+                        help='Sample rate (default: 44100)')
+    parser.add_argument('--buffer-size', type=int, default=512,
+                        help='Audio block size (default: 512)')
+
+    parser.add_argument('--listen-port', type=int, default=None,
+                        help='Receive face blob/mouth FUDI messages on this UDP port (default: disabled)')
+
+    return parser.parse_args()
+
+
+def render_to_file(engine, path, duration):
+    total = int(duration * engine.sample_rate)
+    start_time = time.time()
+    with sf.SoundFile(path, mode='w', samplerate=engine.sample_rate, channels=1, subtype='FLOAT') as f:
+        written = 0
+        while written < total:
+            frames = min(engine.block_size, total - written)
+            f.write(engine.render(frames))
+            written += frames
+    elapsed = time.time() - start_time
+    print(f"Rendered {duration:.1f}s to {path} in {elapsed:.2f}s ({duration / max(elapsed, 1e-9):.1f}x real time)")
+
+
+def play(engine):
+    import pyaudio
+
+    def callback(in_data, frame_count, time_info, status):
+        return (engine.render(frame_count).tobytes(), pyaudio.paContinue)
+
+    p = pyaudio.PyAudio()
+    stream = p.open(
+        format=pyaudio.paFloat32,
+        channels=1,
+        rate=engine.sample_rate,
+        output=True,
+        frames_per_buffer=engine.block_size,
+        stream_callback=callback
+    )
+    stream.start_stream()
+    print("Playing, press Ctrl+C to quit")
+    try:
+        while stream.is_active():
+            time.sleep(0.1)
+    finally:
+        stream.stop_stream()
+        stream.close()
+        p.terminate()
+
+
+def main():
+    args = parse_arguments()
+
+    if args.notes is not None and len(args.notes) != args.voices:
+        print(f"Error: --notes needs {args.voices} values, got {len(args.notes)}.")
+        return
+
+    engine = AmbientEngine(
+        sample_rate=args.sample_rate,
+        block_size=args.buffer_size,
+        num_voices=args.voices,
+        seed=args.seed,
+        notes=args.notes
+    )
+
+    print("Generative ambient engine:")
+    print(f"  - Voices: {args.voices}")
+    print(f"  - Notes: {' '.join(str(int(n)) for n in engine.notes)}")
+    print(f"  - Loop lengths (ms): {' '.join(str(int(n)) for n in np.round(engine.loop_samples * 1000 / args.sample_rate))}")
+
+    listener = None
+    if args.listen_port:
+        listener = FudiListener(engine, args.listen_port)
+        listener.start()
+        print(f"  - Listening for face features on UDP {args.listen_port}")
+
+    try:
+        if args.output:
+            render_to_file(engine, args.output, args.duration)
+        else:
+            play(engine)
+    except KeyboardInterrupt:
+        print("quit program.")
+    finally:
+        if listener:
+            listener.stop()
+
+
+if __name__ == "__main__":
+    main()
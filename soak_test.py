@@ -0,0 +1,390 @@
+import argparse
+import csv
+import importlib.util
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import cv2
+import soundfile as sf
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+TRACKING_DIR = os.path.join(ROOT, "1 - Face Tracking to OSC")
+AUDIO_DIR = os.path.join(ROOT, "2 - Direct Audio Processing")
+
+
+def load_module(name, path):
+    """import a module by file path (the research folders are not packages)"""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def get_rss_mb():
+    """current resident set size in MB"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 1e6
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except OSError:
+        # peak instead of current RSS, still shows monotonic growth
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1e6 if sys.platform == "darwin" else peak / 1e3
+
+
+def slope_per_hour(times, values):
+    """least-squares trend of values over time, in units per hour"""
+    if len(times) < 2:
+        return 0.0
+    return float(np.polyfit(np.asarray(times) / 3600.0, np.asarray(values), 1)[0])
+
+
+class SyntheticCamera:
+    """cycles through a fixed set of generated face-like frames with a moving mouth"""
+
+    def __init__(self, width=640, height=480, num_frames=60):
+        self.frames = []
+        for i in range(num_frames):
+            frame = np.full((height, width, 3), 60, dtype=np.uint8)
+            cx, cy = width // 2, height // 2
+            cv2.ellipse(frame, (cx, cy), (width // 6, height // 4), 0, 0, 360, (150, 180, 220), -1)
+            cv2.circle(frame, (cx - width // 16, cy - height // 12), 12, (40, 40, 40), -1)
+            cv2.circle(frame, (cx + width // 16, cy - height // 12), 12, (40, 40, 40), -1)
+            mouth = int(4 + 30 * (0.5 + 0.5 * np.sin(2 * np.pi * i / num_frames)))
+            cv2.ellipse(frame, (cx, cy + height // 8), (width // 14, mouth), 0, 0, 360, (30, 30, 120), -1)
+            self.frames.append(frame)
+        self.index = 0
+
+    def read(self):
+        frame = self.frames[self.index]
+        self.index = (self.index + 1) % len(self.frames)
+        return True, frame
+
+    def release(self):
+        pass
+
+
+class VideoFileCamera:
+    """plays a recorded video in a loop"""
+
+    def __init__(self, path):
+        self.path = path
+        self.cap = cv2.VideoCapture(path)
+        if not self.cap.isOpened():
+            raise IOError(f"cannot open video {path}")
+
+    def read(self):
+        ret, frame = self.cap.read()
+        if not ret:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read()
+        return ret, frame
+
+    def release(self):
+        self.cap.release()
+
+
+def write_test_stems(directory, sample_rate=44100, seconds=8):
+    """two synthetic stems so the audio path runs without input files"""
+    t = np.arange(sample_rate * seconds) / sample_rate
+    paths = []
+    for i, freq in enumerate([110.0, 330.0]):
+        path = os.path.join(directory, f"soak_stem_{i}.wav")
+        sf.write(path, 0.4 * np.sin(2 * np.pi * freq * t) * (0.6 + 0.4 * np.sin(2 * np.pi * 0.25 * t)), sample_rate)
+        paths.append(path)
+    return paths
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description='Long-run soak test of the tracking, OSC and audio pipeline')
+
+    parser.add_argument('--duration', type=float, default=3600,
+                        help='Test duration in seconds (default: 3600)')
+    parser.add_argument('--sample-interval', type=float, default=10,
+                        help='Seconds between metric samples (default: 10)')
+    parser.add_argument('--warmup', type=float, default=30,
+                        help='Seconds excluded from trend analysis (default: 30)')
+
+    parser.add_argument('--video', type=str, default=None,
+                        help='Recorded video to loop as input (default: synthetic frames)')
+    parser.add_argument('--tracker', type=str, default='facemesh', choices=['facemesh', 'landmarker'],
+                        help='Face tracker (default: facemesh)')
+    parser.add_argument('--model', type=str, default=os.path.join(TRACKING_DIR, 'face_landmarker.task'),
+                        help='FaceLandmarker model path')
+    parser.add_argument('--osc-port', type=int, default=9999,
+                        help='UDP port the OSC messages are sent to on localhost (default: 9999)')
+
+    parser.add_argument('--audio', type=str, nargs='*', default=None,
+                        help='Audio stems (default: generated test stems)')
+    parser.add_argument('--backend', type=str, default='null',
+                        help='Audio output backend (default: null)')
+    parser.add_argument('--buffer-size', type=int, default=1024,
+                        help='Audio buffer size (default: 1024)')
+    parser.add_argument('--no-audio', action='store_true',
+                        help='Run without the audio engine')
+
+    parser.add_argument('--no-tracemalloc', action='store_true',
+                        help='Disable tracemalloc (lower overhead, no allocation counts)')
+    parser.add_argument('--csv', type=str, default=None,
+                        help='Write the metric samples to this CSV file')
+
+    parser.add_argument('--max-rss-growth', type=float, default=50.0,
+                        help='Flag RSS growth above this many MB per hour (default: 50)')
+    parser.add_argument('--max-blocks-per-frame', type=float, default=0.5,
+                        help='Flag growth of live Python allocations above this many blocks per frame (default: 0.5)')
+    parser.add_argument('--max-fps-drop', type=float, default=10.0,
+                        help='Flag an FPS drop above this percentage (default: 10)')
+    parser.add_argument('--max-callback-ms', type=float, default=None,
+                        help='Flag audio callbacks slower than this (default: half a buffer)')
+    parser.add_argument('--max-xruns-per-hour', type=float, default=6.0,
+                        help='Flag audio underruns plus late producer wake-ups above this rate (default: 6)')
+    parser.add_argument('--min-trend-span', type=float, default=600,
+                        help='Seconds after warmup needed before RSS growth and FPS/callback drift are flagged (default: 600)')
+
+    return parser.parse_args()
+
+
+def take_sample(elapsed, frames, window_frames, window_time, face_tracker, osc_sender,
+                audio_processor, detections):
+    sample = {
+        "time_s": round(elapsed, 2),
+        "frames": frames,
+        "fps": window_frames / window_time if window_time > 0 else 0.0,
+        "tracker_fps": face_tracker.fps,
+        "detection_rate": detections / window_frames if window_frames else 0.0,
+        "rss_mb": get_rss_mb(),
+        "osc_messages": osc_sender.get_statistics()["total_messages"],
+    }
+
+    if tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        # leave out the allocations of tracemalloc and the snapshots themselves
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "*/collections/__init__.py"),
+        ])
+        sample["traced_mb"] = current / 1e6
+        sample["traced_blocks"] = sum(stat.count for stat in snapshot.statistics("filename"))
+    else:
+        snapshot = None
+
+    if audio_processor:
+        stats = audio_processor.get_statistics()
+        sample["underruns"] = stats["underruns"]
+        sample["producer_late"] = stats["producer_late"]
+        sample["audio_callbacks"] = stats["callbacks"]
+        sample["callback_ms_avg"] = stats["callback_ms_avg"]
+        sample["callback_ms_max"] = stats["callback_ms_max"]
+        sample["callback_interval_ms_max"] = stats["callback_interval_ms_max"]
+        audio_processor.reset_callback_timing()
+
+    return sample, snapshot
+
+
+def analyse(samples, args, block_ms):
+    """summary values and flags, trends ignore the warmup period"""
+    steady = [s for s in samples if s["time_s"] >= args.warmup] or samples
+    times = [s["time_s"] for s in steady]
+    flags = []
+    summary = {}
+
+    # short runs still report the trends, but a straight line over a few samples is mostly noise
+    summary["steady_span_s"] = times[-1] - times[0]
+    trends_trusted = summary["steady_span_s"] >= args.min_trend_span
+
+    summary["frames"] = samples[-1]["frames"]
+    summary["avg_fps"] = float(np.mean([s["fps"] for s in steady]))
+    summary["detection_rate"] = float(np.mean([s["detection_rate"] for s in steady]))
+
+    rss = [s["rss_mb"] for s in steady]
+    summary["rss_start_mb"] = rss[0]
+    summary["rss_end_mb"] = rss[-1]
+    summary["rss_growth_mb_per_hour"] = slope_per_hour(times, rss)
+    if trends_trusted and summary["rss_growth_mb_per_hour"] > args.max_rss_growth:
+        flags.append(f"RSS grows {summary['rss_growth_mb_per_hour']:.1f} MB/h (limit {args.max_rss_growth})")
+
+    if "traced_blocks" in steady[0]:
+        frames = [s["frames"] for s in steady]
+        blocks = [s["traced_blocks"] for s in steady]
+        summary["traced_growth_mb_per_hour"] = slope_per_hour(times, [s["traced_mb"] for s in steady])
+        summary["live_blocks_per_frame"] = float(np.polyfit(frames, blocks, 1)[0]) if len(steady) > 1 else 0.0
+        if summary["live_blocks_per_frame"] > args.max_blocks_per_frame:
+            flags.append(f"Python allocations grow by {summary['live_blocks_per_frame']:.2f} live blocks per frame "
+                         f"(limit {args.max_blocks_per_frame})")
+
+    # compare the first and last quarter of the steady run
+    quarter = max(1, len(steady) // 4)
+    fps_first = np.mean([s["fps"] for s in steady[:quarter]])
+    fps_last = np.mean([s["fps"] for s in steady[-quarter:]])
+    summary["fps_drift_percent"] = 100.0 * (fps_last - fps_first) / fps_first if fps_first else 0.0
+    summary["fps_slope_per_hour"] = slope_per_hour(times, [s["fps"] for s in steady])
+    if trends_trusted and -summary["fps_drift_percent"] > args.max_fps_drop:
+        flags.append(f"FPS dropped {-summary['fps_drift_percent']:.1f}% (limit {args.max_fps_drop}%)")
+
+    summary["osc_messages"] = samples[-1]["osc_messages"]
+    summary["osc_messages_per_second"] = summary["osc_messages"] / max(samples[-1]["time_s"], 1e-9)
+
+    if "underruns" in steady[0]:
+        summary["underruns"] = steady[-1]["underruns"] - steady[0]["underruns"]
+        summary["producer_late"] = steady[-1]["producer_late"] - steady[0]["producer_late"]
+        summary["callback_ms_max"] = max(s["callback_ms_max"] for s in steady)
+        cb_first = np.mean([s["callback_ms_avg"] for s in steady[:quarter]])
+        cb_last = np.mean([s["callback_ms_avg"] for s in steady[-quarter:]])
+        summary["callback_drift_percent"] = 100.0 * (cb_last - cb_first) / cb_first if cb_first else 0.0
+        max_callback_ms = args.max_callback_ms or block_ms / 2
+        xruns = summary["underruns"] + summary["producer_late"]
+        summary["xruns_per_hour"] = xruns * 3600.0 / summary["steady_span_s"] if summary["steady_span_s"] > 0 else 0.0
+        if summary["xruns_per_hour"] > args.max_xruns_per_hour:
+            flags.append(f"{summary['underruns']} audio underruns, {summary['producer_late']} late producer wake-ups "
+                         f"after warmup ({summary['xruns_per_hour']:.1f}/h, limit {args.max_xruns_per_hour})")
+        if summary["callback_ms_max"] > max_callback_ms:
+            flags.append(f"Audio callback took {summary['callback_ms_max']:.2f} ms (limit {max_callback_ms:.2f} ms)")
+        if trends_trusted and summary["callback_drift_percent"] > 50.0:
+            flags.append(f"Audio callback time grew {summary['callback_drift_percent']:.0f}%")
+
+    return summary, flags
+
+
+def main():
+    args = parse_arguments()
+
+    osc_module = load_module("osc_sender", os.path.join(TRACKING_DIR, "osc_sender.py"))
+    if args.tracker == 'landmarker':
+        landmarker_module = load_module("face_landmarker", os.path.join(TRACKING_DIR, "face_landmarker.py"))
+        face_tracker = landmarker_module.FaceLandmarkerTracker(model_path=args.model, draw_debug=False)
+    else:
+        tracker_module = load_module("tracking_face_tracker", os.path.join(TRACKING_DIR, "face_tracker.py"))
+        face_tracker = tracker_module.FaceTracker(draw_debug=False)
+    osc_sender = osc_module.OscSender(ip="127.0.0.1", port=args.osc_port)
+
+    camera = VideoFileCamera(args.video) if args.video else SyntheticCamera()
+
+    audio_processor = None
+    temp_dir = None
+    if not args.no_audio:
+        # the audio folder's modules import each other by name
+        sys.path.insert(0, AUDIO_DIR)
+        audio_module = load_module("audio_processor", os.path.join(AUDIO_DIR, "audio_processor.py"))
+        stems = args.audio
+        if not stems:
+            temp_dir = tempfile.TemporaryDirectory()
+            stems = write_test_stems(temp_dir.name)
+        audio_processor = audio_module.AudioProcessor(
+            audio_file=stems,
+            buffer_size=args.buffer_size,
+            backend=args.backend
+        )
+    block_ms = 1000.0 * args.buffer_size / (audio_processor.sample_rate if audio_processor else 44100)
+
+    print("Soak test:")
+    print(f"  - Duration: {args.duration:.0f}s, sample every {args.sample_interval:.0f}s")
+    print(f"  - Input: {args.video or 'synthetic frames'}")
+    print(f"  - Tracker: {args.tracker}")
+    print(f"  - Audio: {args.backend if audio_processor else 'off'}")
+
+    if not args.no_tracemalloc:
+        tracemalloc.start()
+
+    samples = []
+    first_snapshot = None
+    last_snapshot = None
+    frames = 0
+    window_frames = 0
+    detections = 0
+
+    if audio_processor:
+        audio_processor.play()
+
+    start_time = time.time()
+    window_start = start_time
+    try:
+        while time.time() - start_time < args.duration:
+            ret, frame = camera.read()
+            if not ret:
+                print("Error: cannot read frame.")
+                break
+
+            _, mouth_value, success = face_tracker.process_frame(frame)
+            osc_sender.send_mouth_value(mouth_value)
+            if audio_processor:
+                audio_processor.set_filter_cutoff(mouth_value / 127.0)
+
+            frames += 1
+            window_frames += 1
+            detections += int(success)
+
+            now = time.time()
+            if now - window_start >= args.sample_interval:
+                sample, snapshot = take_sample(now - start_time, frames, window_frames, now - window_start,
+                                               face_tracker, osc_sender, audio_processor, detections)
+                samples.append(sample)
+                if snapshot is not None:
+                    if first_snapshot is None and sample["time_s"] >= args.warmup:
+                        first_snapshot = snapshot
+                    last_snapshot = snapshot
+                print(f"[{sample['time_s']:8.0f}s] fps {sample['fps']:6.1f}  rss {sample['rss_mb']:7.1f} MB  "
+                      f"osc {sample['osc_messages']}" +
+                      (f"  underruns {sample['underruns']} late {sample['producer_late']}" if audio_processor else ""))
+                # the snapshot itself is not counted in the next window
+                window_start = time.time()
+                window_frames = 0
+                detections = 0
+
+    except KeyboardInterrupt:
+        print("Soak test interrupted, reporting collected samples")
+
+    finally:
+        if audio_processor:
+            audio_processor.release()
+        face_tracker.release()
+        camera.release()
+        if temp_dir:
+            temp_dir.cleanup()
+
+    if len(samples) < 2:
+        print("Not enough samples for a report, run longer than two sample intervals.")
+        return 1
+
+    if args.csv:
+        fields = list(samples[0].keys())
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(samples)
+
+    summary, flags = analyse(samples, args, block_ms)
+    if summary["steady_span_s"] < args.min_trend_span:
+        print(f"Note: {summary['steady_span_s']:.0f}s after warmup is shorter than --min-trend-span "
+              f"({args.min_trend_span:.0f}s), RSS growth and FPS/callback drift are reported but not flagged.")
+
+    print()
+    print("Soak test summary:")
+    for key, value in summary.items():
+        print(f"  - {key}: {value:.3f}" if isinstance(value, float) else f"  - {key}: {value}")
+
+    if first_snapshot is not None and last_snapshot is not None and first_snapshot is not last_snapshot:
+        print("Top allocation growth since warmup:")
+        for stat in last_snapshot.compare_to(first_snapshot, "lineno")[:5]:
+            print(f"  {stat}")
+
+    if flags:
+        print("FLAGGED:")
+        for flag in flags:
+            print(f"  ! {flag}")
+        return 1
+
+    print("No leaks or slowdowns detected.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())